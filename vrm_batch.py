@@ -0,0 +1,266 @@
+"""Runs VRM Physics Enhancer operators over a directory of VRM files with a pool of headless Blender workers.
+
+Controller (plain Python or Blender):
+    python vrm_batch.py --input models/ --output out/ --ops vrm.add_breast_physics,vrm.breast_physics_tweaker --workers 4
+    blender --background --python vrm_batch.py -- --input models/ --output out/ --ops vrm.add_arm_hand_colliders
+
+Each worker is started as `blender --background --python vrm_batch.py -- --worker`, reads one JSON job per line
+from stdin and answers with one result line prefixed by RESULT_PREFIX, so Blender's own output can be skipped.
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+RESULT_PREFIX = "VRM_BATCH_RESULT "
+
+# Module names the VRM addon is installed under, as a legacy addon and as a Blender extension
+VRM_ADDON_MODULES = ["io_scene_vrm", "bl_ext.blender_org.vrm", "VRM_Addon_for_Blender-release"]
+
+
+def script_args(argv=None):
+    """Arguments after '--' when run by Blender, otherwise everything after the script name"""
+    argv = sys.argv if argv is None else argv
+    if "--" in argv:
+        return argv[argv.index("--") + 1:]
+    return argv[1:]
+
+
+# Worker side, only ever imported inside Blender
+
+def ensure_addons():
+    """Enables the VRM addon and registers this enhancer if they are not loaded yet"""
+    import bpy
+    import addon_utils
+
+    if not hasattr(bpy.ops.import_scene, "vrm"):
+        for module_name in VRM_ADDON_MODULES:
+            try:
+                addon_utils.enable(module_name, default_set=True)
+            except Exception:
+                continue
+            if hasattr(bpy.ops.import_scene, "vrm"):
+                break
+        else:
+            raise RuntimeError("VRM Addon for Blender is not installed")
+
+    if not hasattr(bpy.types, "VRM_PT_Physics_Enhancer_Panel"):
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import vrm_physics_enhancer
+        vrm_physics_enhancer.register()
+
+
+def reset_scene():
+    """Clears the previous model so the next job starts from an empty scene without restarting Blender"""
+    import bpy
+
+    if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    # Loading the empty home file replaces the whole main database, so nothing of the previous model is left over
+    bpy.ops.wm.read_homefile(use_empty=True)
+
+
+def apply_settings(scene, settings):
+    """Copies scene property values (vrm_* names from the panel) onto the scene"""
+    for name, value in settings.items():
+        if not hasattr(scene, name):
+            raise KeyError(f"Unknown scene setting {name}")
+        setattr(scene, name, tuple(value) if isinstance(value, list) else value)
+
+
+def run_operator(idname):
+    """Calls an operator such as 'vrm.add_jiggle_bones' and returns its result set"""
+    import bpy
+
+    module_name, op_name = idname.split(".", 1)
+    operator = getattr(getattr(bpy.ops, module_name), op_name)
+    # The enhancer operators look the armature up themselves but mode_set still needs an active object
+    armature = next((obj for obj in bpy.data.objects if obj.type == 'ARMATURE'), None)
+    if armature is not None and bpy.context.view_layer.objects.active is None:
+        bpy.context.view_layer.objects.active = armature
+    return operator()
+
+
+def run_job(job):
+    """Imports job['input'], runs job['operators'] and job['recipe'] with job['settings'] and exports to job['output']"""
+    import bpy
+
+    start = time.perf_counter()
+    result = {"id": None, "input": None, "output": None, "ok": False, "operators": []}
+    try:
+        result.update({"id": job.get("id"), "input": job.get("input"), "output": job.get("output")})
+        reset_scene()
+        phase_start = time.perf_counter()
+        bpy.ops.import_scene.vrm(filepath=job["input"])
+        result["import_seconds"] = time.perf_counter() - phase_start
+
+        apply_settings(bpy.context.scene, job.get("settings", {}))
+        operators = list(job.get("operators", []))
+        if job.get("recipe"):
+            # The recipe runs after any listed operators, as one vrm.run_recipe call
+            bpy.context.scene.vrm_recipe_path = job["recipe"]
+            operators.append("vrm.run_recipe")
+        for idname in operators:
+            phase_start = time.perf_counter()
+            status = run_operator(idname)
+            result["operators"].append({"operator": idname, "result": sorted(status), "seconds": time.perf_counter() - phase_start})
+            if 'FINISHED' not in status:
+                raise RuntimeError(f"{idname} returned {sorted(status)}")
+
+        if job.get("output"):
+            phase_start = time.perf_counter()
+            os.makedirs(os.path.dirname(os.path.abspath(job["output"])), exist_ok=True)
+            bpy.ops.export_scene.vrm(filepath=job["output"])
+            result["export_seconds"] = time.perf_counter() - phase_start
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def worker_main():
+    """Answers one result line per job line on stdin until stdin closes"""
+    ensure_addons()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        result = run_job(json.loads(line))
+        sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+# Controller side, needs nothing but the standard library
+
+class Worker:
+    """One headless Blender process fed jobs over stdin"""
+
+    def __init__(self, blender, worker_id):
+        self.blender = blender
+        self.worker_id = worker_id
+        self.process = None
+
+    def start(self):
+        command = [self.blender, "--background", "--python", os.path.abspath(__file__), "--", "--worker"]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    def run(self, job):
+        """Sends one job and waits for its result line, restarting the process if it died"""
+        try:
+            if self.process is None or self.process.poll() is not None:
+                self.process = None
+                self.start()
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+            for line in self.process.stdout:
+                if line.startswith(RESULT_PREFIX):
+                    return json.loads(line[len(RESULT_PREFIX):])
+        except OSError as e:
+            # Blender could not be started at all, e.g. a wrong --blender path
+            if self.process is None:
+                return {"id": job.get("id"), "input": job["input"], "output": job.get("output"), "ok": False, "error": f"Could not start Blender: {e}"}
+        # Blender exited before answering, usually a crash inside an operator or the importer
+        self.process = None
+        return {"id": job.get("id"), "input": job["input"], "output": job.get("output"), "ok": False, "error": "Worker exited before returning a result"}
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process = None
+
+
+def collect_jobs(input_dir, output_dir, operators, settings, recipe=None):
+    """One job per .vrm file in input_dir, exported under the same name to output_dir"""
+    jobs = []
+    for job_id, path in enumerate(sorted(glob.glob(os.path.join(input_dir, "*.vrm")))):
+        output = os.path.join(output_dir, os.path.basename(path)) if output_dir else None
+        jobs.append({"id": job_id, "input": os.path.abspath(path), "output": output and os.path.abspath(output), "operators": operators, "settings": settings, "recipe": recipe and os.path.abspath(recipe)})
+    return jobs
+
+
+def run_batch(jobs, blender, worker_count, report):
+    """Spreads jobs over worker_count Blender processes and writes one JSON line per finished job to report"""
+    job_queue = queue.Queue()
+    for job in jobs:
+        job_queue.put(job)
+    lock = threading.Lock()
+    failures = []
+
+    def feed(worker):
+        while True:
+            try:
+                job = job_queue.get_nowait()
+            except queue.Empty:
+                break
+            result = worker.run(job)
+            result["worker"] = worker.worker_id
+            with lock:
+                report.write(json.dumps(result) + "\n")
+                report.flush()
+                if not result["ok"]:
+                    failures.append(result)
+        worker.stop()
+
+    workers = [Worker(blender, worker_id) for worker_id in range(max(1, min(worker_count, len(jobs))))]
+    threads = [threading.Thread(target=feed, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return failures
+
+
+def default_blender():
+    try:
+        import bpy
+        return bpy.app.binary_path
+    except ImportError:
+        return "blender"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run VRM Physics Enhancer operators over a directory of VRM files")
+    parser.add_argument("--worker", action="store_true", help="Run as a worker reading jobs from stdin (used internally)")
+    parser.add_argument("--input", help="Directory of .vrm files to process")
+    parser.add_argument("--output", help="Directory to export processed .vrm files to")
+    parser.add_argument("--ops", default="", help="Comma-separated operator ids, e.g. vrm.add_breast_physics,vrm.breast_physics_tweaker")
+    parser.add_argument("--recipe", help="JSON or TOML recipe run after --ops, see vrm.run_recipe")
+    parser.add_argument("--settings", help="JSON file of scene settings (vrm_* panel properties) applied before the operators")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Number of Blender processes")
+    parser.add_argument("--blender", default=default_blender(), help="Blender executable used for workers")
+    parser.add_argument("--report", help="JSON lines file for per-file results (defaults to stdout)")
+    args = parser.parse_args(script_args())
+
+    if args.worker:
+        worker_main()
+        return 0
+    if not args.input:
+        parser.error("--input is required")
+
+    settings = {}
+    if args.settings:
+        with open(args.settings, 'r') as f:
+            settings = json.load(f)
+    operators = [op.strip() for op in args.ops.split(",") if op.strip()]
+    jobs = collect_jobs(args.input, args.output, operators, settings, args.recipe)
+
+    report = open(args.report, 'w') if args.report else sys.stdout
+    try:
+        start = time.perf_counter()
+        failures = run_batch(jobs, args.blender, args.workers, report)
+    finally:
+        if report is not sys.stdout:
+            report.close()
+    print(f"Processed {len(jobs)} file(s) in {time.perf_counter() - start:.1f} s, {len(failures)} failed", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
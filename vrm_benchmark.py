@@ -0,0 +1,376 @@
+"""Benchmarks the VRM Physics Enhancer operators on procedurally built VRoid-style rigs.
+
+    blender --background --python vrm_benchmark.py -- --sizes 10000,100000,1000000 --output bench.json
+    blender --background --python vrm_benchmark.py -- --sizes 10000 --ops vrm.add_long_dress_collision --compare bench.json
+
+Each rig has a J_Bip_* body skeleton, J_Sec_* bust, skirt and hair chains, a mirror-symmetric body mesh weighted
+to them, and spring_bone1 springs, joints and colliders. A rig is built once per size and saved, then reloaded
+before every operator run so each one starts from the same model. Wall time is measured without the profiler;
+a separate profiled run breaks each operator down into the enhancer functions it spends its time in.
+"""
+import argparse
+import cProfile
+import json
+import math
+import os
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from vrm_batch import ensure_addons, script_args
+
+DEFAULT_OPERATORS = [
+    "vrm.add_breast_physics",
+    "vrm.breast_physics_tweaker",
+    "vrm.add_long_hair_collider",
+    "vrm.add_arm_hand_colliders",
+    "vrm.add_long_dress_collision",
+    "vrm.improve_long_dress_topology",
+    "vrm.add_jiggle_bones",
+    "vrm.breast_blend_shape_scaler",
+    "vrm.scale_model_physics",
+]
+
+# (name, parent, head, tail) of the body bones, VRoid faces -Y and its left side is +X
+BODY_BONES = [
+    ("J_Bip_C_Hips", None, (0.0, 0.0, 0.90), (0.0, 0.0, 1.00)),
+    ("J_Bip_C_Spine", "J_Bip_C_Hips", (0.0, 0.0, 1.00), (0.0, 0.0, 1.10)),
+    ("J_Bip_C_Chest", "J_Bip_C_Spine", (0.0, 0.0, 1.10), (0.0, 0.0, 1.30)),
+    ("J_Bip_C_UpperChest", "J_Bip_C_Chest", (0.0, 0.0, 1.30), (0.0, 0.0, 1.42)),
+    ("J_Bip_C_Neck", "J_Bip_C_UpperChest", (0.0, 0.0, 1.42), (0.0, 0.0, 1.50)),
+    ("J_Bip_C_Head", "J_Bip_C_Neck", (0.0, 0.0, 1.50), (0.0, 0.0, 1.70)),
+]
+for _side, _x in (("L", 1.0), ("R", -1.0)):
+    BODY_BONES += [
+        (f"J_Bip_{_side}_UpperLeg", "J_Bip_C_Hips", (0.09 * _x, 0.0, 0.90), (0.09 * _x, 0.0, 0.50)),
+        (f"J_Bip_{_side}_LowerLeg", f"J_Bip_{_side}_UpperLeg", (0.09 * _x, 0.0, 0.50), (0.09 * _x, 0.0, 0.10)),
+        (f"J_Bip_{_side}_Foot", f"J_Bip_{_side}_LowerLeg", (0.09 * _x, 0.0, 0.10), (0.09 * _x, -0.10, 0.02)),
+        (f"J_Bip_{_side}_UpperArm", "J_Bip_C_UpperChest", (0.18 * _x, 0.0, 1.40), (0.42 * _x, 0.0, 1.40)),
+        (f"J_Bip_{_side}_LowerArm", f"J_Bip_{_side}_UpperArm", (0.42 * _x, 0.0, 1.40), (0.64 * _x, 0.0, 1.40)),
+        (f"J_Bip_{_side}_Hand", f"J_Bip_{_side}_LowerArm", (0.64 * _x, 0.0, 1.40), (0.72 * _x, 0.0, 1.40)),
+        (f"J_Sec_{_side}_Bust1", "J_Bip_C_Chest", (0.08 * _x, -0.06, 1.25), (0.09 * _x, -0.12, 1.25)),
+        (f"J_Sec_{_side}_Bust2", f"J_Sec_{_side}_Bust1", (0.09 * _x, -0.12, 1.25), (0.10 * _x, -0.17, 1.24)),
+    ]
+
+# Skirt rows from the waist down, the last row also gets _end bones like VRoid exports
+SKIRT_TOP = 0.90
+SKIRT_BOTTOM = 0.30
+SKIRT_ROWS = 3
+SKIRT_DIRECTIONS = ("Front", "Back")
+
+
+def body_radius(z, phi):
+    """Radius of the body tube at height z and angle phi from the front (-Y), flared into a skirt and with a bust"""
+    radius = np.full_like(z, 0.13)
+    skirt = z < SKIRT_TOP
+    radius[skirt] += 0.3 * (SKIRT_TOP - z[skirt])
+    bust = np.exp(-((z - 1.25) / 0.06) ** 2) * np.exp(-((np.abs(phi) - 0.5) / 0.35) ** 2)
+    return radius + 0.05 * bust
+
+
+def build_mesh(vertex_count):
+    """Mirror-symmetric body tube with about vertex_count vertices, as (positions, quads, phi)"""
+    segments = max(16, int(math.sqrt(vertex_count / 2.0)) * 2)
+    rings = max(2, vertex_count // segments)
+    # Half-step angles keep every vertex paired with one at -X
+    theta = 2.0 * np.pi * (np.arange(segments) + 0.5) / segments
+    z = np.linspace(SKIRT_BOTTOM, 1.55, rings)
+    theta_grid, z_grid = np.meshgrid(theta, z)
+    theta_grid, z_grid = theta_grid.ravel(), z_grid.ravel()
+    phi = np.arctan2(np.cos(theta_grid), -np.sin(theta_grid))
+    radius = body_radius(z_grid, phi)
+    positions = np.column_stack((radius * np.cos(theta_grid), radius * np.sin(theta_grid), z_grid))
+
+    ring = np.arange(rings - 1)[:, None] * segments
+    segment = np.arange(segments)[None, :]
+    following = (segment + 1) % segments
+    quads = np.stack((ring + segment, ring + following, ring + segments + following, ring + segments + segment), axis=-1).reshape(-1, 4)
+    return positions, quads, phi
+
+
+def skirt_groups(positions, phi, chains):
+    """{group name: (vertices, weights)} for the skirt chains, split by side, front/back, row and chain"""
+    groups = {}
+    z = positions[:, 2]
+    in_skirt = z < SKIRT_TOP
+    row_height = (SKIRT_TOP - SKIRT_BOTTOM) / SKIRT_ROWS
+    rows = np.minimum(((SKIRT_TOP - z) / row_height).astype(np.int64), SKIRT_ROWS - 1)
+    # Position within the row, 0 at its top and 1 at its bottom
+    row_fraction = np.clip((SKIRT_TOP - z) / row_height - rows, 0.0, 1.0)
+    sides = np.where(positions[:, 0] >= 0.0, "L", "R")
+    directions = np.where(positions[:, 1] <= 0.0, "Front", "Back")
+    # Chains split each quarter of the skirt by angle
+    quarter = np.abs(np.abs(phi) - np.pi / 2.0) / (np.pi / 2.0)
+    chain_ids = np.minimum((quarter * chains).astype(np.int64), chains - 1) + 1
+    for side in ("L", "R"):
+        for direction in SKIRT_DIRECTIONS:
+            for chain in range(1, chains + 1):
+                member = in_skirt & (sides == side) & (directions == direction) & (chain_ids == chain)
+                for row in range(SKIRT_ROWS):
+                    verts = np.flatnonzero(member & (rows == row))
+                    groups[f"J_Sec_{side}_Skirt{direction}{row}_{chain:02d}"] = (verts, 1.0 - 0.5 * row_fraction[verts])
+                # The lowest part of the last row also follows the end bone
+                verts = np.flatnonzero(member & (rows == SKIRT_ROWS - 1) & (row_fraction > 0.5))
+                groups[f"J_Sec_{side}_Skirt{direction}{SKIRT_ROWS - 1}_end_{chain:02d}"] = (verts, row_fraction[verts] - 0.5)
+    return groups
+
+
+def body_groups(positions, phi):
+    """{group name: (vertices, weights)} for the body and bust bones"""
+    x, y, z = positions[:, 0], positions[:, 1], positions[:, 2]
+    groups = {
+        "J_Bip_C_Hips": np.flatnonzero((z >= 0.85) & (z < 1.0)),
+        "J_Bip_C_Spine": np.flatnonzero((z >= 1.0) & (z < 1.1)),
+        "J_Bip_C_Chest": np.flatnonzero((z >= 1.1) & (z < 1.3)),
+        "J_Bip_C_UpperChest": np.flatnonzero((z >= 1.3) & (z < 1.42)),
+        "J_Bip_C_Neck": np.flatnonzero(z >= 1.42),
+    }
+    groups = {name: (verts, np.ones(len(verts))) for name, verts in groups.items()}
+    for side, sign in (("L", 1.0), ("R", -1.0)):
+        leg = np.flatnonzero((z < 0.9) & (x * sign > 0.0))
+        groups[f"J_Bip_{side}_UpperLeg"] = (leg, np.clip((z[leg] - 0.5) / 0.4, 0.05, 1.0))
+        # Bust1 holds the base of the breast and Bust2 its tip
+        bust = np.flatnonzero((np.abs(z - 1.25) < 0.1) & (y < 0.0) & (x * sign > 0.0) & (np.abs(np.abs(phi) - 0.5) < 0.45))
+        depth = np.clip((-y[bust] - 0.1) / 0.08, 0.0, 1.0)
+        groups[f"J_Sec_{side}_Bust1"] = (bust, 1.0 - 0.7 * depth)
+        groups[f"J_Sec_{side}_Bust2"] = (bust, 0.1 + 0.7 * depth)
+    return groups
+
+
+def assign_groups(mesh_obj, groups):
+    """Creates the vertex groups, with one vg.add call per distinct (rounded) weight"""
+    for name, (verts, weights) in groups.items():
+        vertex_group = mesh_obj.vertex_groups.new(name=name)
+        weights = np.round(np.asarray(weights, dtype=np.float64), 2)
+        for value in np.unique(weights):
+            if value > 0.0:
+                vertex_group.add(verts[weights == value].tolist(), float(value), 'REPLACE')
+
+
+def build_armature(skirt_chains, hair_chains):
+    """Armature object with the body, bust, skirt and hair bones, returns (object, skirt chains, hair chains)"""
+    armature_data = bpy.data.armatures.new("Armature")
+    armature = bpy.data.objects.new("Armature", armature_data)
+    bpy.context.scene.collection.objects.link(armature)
+    bpy.context.view_layer.objects.active = armature
+    bpy.ops.object.mode_set(mode='EDIT')
+    edit_bones = armature_data.edit_bones
+
+    def add_bone(name, parent, head, tail):
+        bone = edit_bones.new(name)
+        bone.head, bone.tail = head, tail
+        if parent:
+            bone.parent = edit_bones[parent]
+
+    for name, parent, head, tail in BODY_BONES:
+        add_bone(name, parent, head, tail)
+
+    skirt = []
+    row_height = (SKIRT_TOP - SKIRT_BOTTOM) / SKIRT_ROWS
+    for side, sign in (("L", 1.0), ("R", -1.0)):
+        for direction, front in (("Front", -1.0), ("Back", 1.0)):
+            for chain in range(1, skirt_chains + 1):
+                # Chains fan out from the side (chain 1) towards the centre of the front or back
+                angle = (chain - 0.5) / skirt_chains * (math.pi / 2.0)
+                dx, dy = sign * math.cos(angle), front * math.sin(angle)
+                names = [f"J_Sec_{side}_Skirt{direction}{row}_{chain:02d}" for row in range(SKIRT_ROWS)]
+                names.append(f"J_Sec_{side}_Skirt{direction}{SKIRT_ROWS - 1}_end_{chain:02d}")
+                parent = "J_Bip_C_Hips"
+                for row, name in enumerate(names):
+                    top = SKIRT_TOP - row * row_height
+                    radius_top, radius_bottom = 0.13 + 0.3 * (SKIRT_TOP - top), 0.13 + 0.3 * (SKIRT_TOP - top + row_height)
+                    add_bone(name, parent, (dx * radius_top, dy * radius_top, top), (dx * radius_bottom, dy * radius_bottom, top - row_height))
+                    parent = name
+                skirt.append(names)
+
+    hair = []
+    for chain in range(1, hair_chains + 1):
+        angle = math.pi * chain / (hair_chains + 1)
+        dx, dy = math.cos(angle), math.sin(angle)
+        names = [f"J_Sec_Hair{segment}_{chain:02d}" for segment in range(1, 4)]
+        parent = "J_Bip_C_Head"
+        for segment, name in enumerate(names):
+            add_bone(name, parent, (0.1 * dx, 0.1 * dy, 1.65 - 0.15 * segment), (0.1 * dx, 0.12 * dy, 1.50 - 0.15 * segment))
+            parent = name
+        hair.append(names)
+
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return armature, skirt, hair
+
+
+def build_springs(armature, skirt, hair):
+    """spring_bone1 springs for the skirt, hair and bust chains, with leg, hip and chest colliders"""
+    spring_bone = armature.data.vrm_addon_extension.spring_bone1
+    collider_names = []
+    for bone_name, radius in (("J_Bip_C_Hips", 0.12), ("J_Bip_L_UpperLeg", 0.08), ("J_Bip_R_UpperLeg", 0.08), ("J_Bip_C_Chest", 0.11), ("J_Bip_C_Head", 0.1)):
+        collider = spring_bone.colliders.add()
+        collider.node.bone_name = bone_name
+        collider.shape.sphere.radius = radius
+        # The VRM addon names colliders itself, groups refer to them by that name
+        collider_names.append(getattr(collider, "name", bone_name))
+    group = spring_bone.collider_groups.add()
+    group.vrm_name = "Body"
+    for collider_name in collider_names:
+        group.colliders.add().collider_name = collider_name
+
+    chains = [(f"Skirt_{names[0]}", names) for names in skirt] + [(f"Hair_{names[0]}", names) for names in hair]
+    chains += [(f"Bust_{side}", [f"J_Sec_{side}_Bust1", f"J_Sec_{side}_Bust2"]) for side in ("L", "R")]
+    for spring_name, names in chains:
+        spring = spring_bone.springs.add()
+        spring.vrm_name = spring_name
+        for bone_name in names:
+            joint = spring.joints.add()
+            joint.node.bone_name = bone_name
+            joint.stiffness = 1.0
+            joint.drag_force = 0.4
+            joint.radius = 0.02
+        spring.collider_groups.add().collider_group_name = "Body"
+    return len(chains)
+
+
+def build_rig(vertex_count, skirt_chains, hair_chains):
+    """Empties the scene and builds one VRoid-style rig, returns its statistics"""
+    bpy.ops.wm.read_homefile(use_empty=True)
+    armature, skirt, hair = build_armature(skirt_chains, hair_chains)
+    spring_count = build_springs(armature, skirt, hair)
+
+    positions, quads, phi = build_mesh(vertex_count)
+    mesh_data = bpy.data.meshes.new("Body")
+    mesh_data.from_pydata(positions.tolist(), [], quads.tolist())
+    mesh_data.update(calc_edges=True)
+    mesh_obj = bpy.data.objects.new("Body", mesh_data)
+    bpy.context.scene.collection.objects.link(mesh_obj)
+    mesh_obj.parent = armature
+    modifier = mesh_obj.modifiers.new("Armature", 'ARMATURE')
+    modifier.object = armature
+
+    groups = body_groups(positions, phi)
+    skirt_weights = skirt_groups(positions, phi, skirt_chains)
+    assign_groups(mesh_obj, groups)
+    assign_groups(mesh_obj, skirt_weights)
+    bpy.context.view_layer.objects.active = armature
+    return {
+        "vertices": len(mesh_data.vertices),
+        "faces": len(mesh_data.polygons),
+        "bones": len(armature.data.bones),
+        "vertex_groups": len(mesh_obj.vertex_groups),
+        "skirt_groups": len(skirt_weights),
+        "springs": spring_count,
+        "joints": sum(len(spring.joints) for spring in armature.data.vrm_addon_extension.spring_bone1.springs),
+    }
+
+
+def profile_phases(profiler, limit):
+    """Enhancer functions an operator spent its time in, by cumulative time"""
+    phases = []
+    for (filename, line, function), (_, calls, _, cumulative, _) in pstats.Stats(profiler).stats.items():
+        if "vrm_physics_enhancer" in os.path.basename(filename) and function != "execute":
+            phases.append({"function": f"{function}:{line}", "calls": calls, "seconds": cumulative})
+    phases.sort(key=lambda phase: phase["seconds"], reverse=True)
+    return phases[:limit]
+
+
+def run_operator(idname, rig_path, profiler=None):
+    """Reloads the saved rig and runs one operator, returns (result, seconds)"""
+    bpy.ops.wm.open_mainfile(filepath=rig_path)
+    scene = bpy.context.scene
+    scene.vrm_diagnostics_level = 'QUIET'
+    armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
+    # Scaling acts on the selected armature
+    bpy.context.view_layer.objects.active = armature
+    armature.select_set(True)
+    operator = getattr(bpy.ops.vrm, idname.partition(".")[2])
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = operator()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    return sorted(result), time.perf_counter() - start
+
+
+def compare(results, previous):
+    """Median time ratio new/old for every (vertices, operator) measured in both runs"""
+    old = {(size["target_vertices"], op["operator"]): op["median_seconds"] for size in previous["sizes"] for op in size["operators"]}
+    comparison = []
+    for size in results["sizes"]:
+        for op in size["operators"]:
+            key = (size["target_vertices"], op["operator"])
+            if key in old and old[key] and op["median_seconds"] is not None:
+                comparison.append({"target_vertices": key[0], "operator": key[1], "previous_seconds": old[key], "seconds": op["median_seconds"], "ratio": op["median_seconds"] / old[key]})
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VRM Physics Enhancer operators on synthetic VRoid-style rigs")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated target vertex counts")
+    parser.add_argument("--ops", default=",".join(DEFAULT_OPERATORS), help="Comma-separated operator ids")
+    parser.add_argument("--skirt-chains", type=int, default=4, help="Skirt chains per side and front/back")
+    parser.add_argument("--hair-chains", type=int, default=8, help="Hair chains")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per operator and size")
+    parser.add_argument("--phases", type=int, default=15, help="Profiled enhancer functions kept per operator, 0 to skip profiling")
+    parser.add_argument("--output", default="vrm_benchmark.json", help="JSON results file")
+    parser.add_argument("--compare", help="Previous results file to compare median times against")
+    args = parser.parse_args(script_args())
+
+    ensure_addons()
+    operators = [op.strip() for op in args.ops.split(",") if op.strip()]
+    results = {
+        "blender": bpy.app.version_string,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {"skirt_chains": args.skirt_chains, "hair_chains": args.hair_chains, "repeat": args.repeat},
+        "sizes": [],
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for target in [int(size) for size in args.sizes.split(",") if size.strip()]:
+            start = time.perf_counter()
+            rig = build_rig(target, args.skirt_chains, args.hair_chains)
+            rig_path = os.path.join(temp_dir, f"rig_{target}.blend")
+            bpy.ops.wm.save_as_mainfile(filepath=rig_path)
+            size_result = {"target_vertices": target, "rig": rig, "build_seconds": time.perf_counter() - start, "operators": []}
+            print(f"Built rig with {rig['vertices']} vertices, {rig['skirt_groups']} skirt groups and {rig['springs']} springs in {size_result['build_seconds']:.1f} s", file=sys.stderr)
+
+            for idname in operators:
+                op_result = {"operator": idname, "runs": [], "median_seconds": None}
+                try:
+                    for _ in range(args.repeat):
+                        status, seconds = run_operator(idname, rig_path)
+                        op_result["runs"].append({"result": status, "seconds": seconds})
+                        # Operators catch their own errors and cancel quickly, which must not pass for a fast run
+                        if 'FINISHED' not in status:
+                            raise RuntimeError(f"{idname} returned {status}")
+                    op_result["median_seconds"] = statistics.median(run["seconds"] for run in op_result["runs"])
+                    if args.phases:
+                        profiler = cProfile.Profile()
+                        run_operator(idname, rig_path, profiler)
+                        op_result["phases"] = profile_phases(profiler, args.phases)
+                except Exception as e:
+                    op_result["error"] = f"{type(e).__name__}: {e}"
+                size_result["operators"].append(op_result)
+                median = op_result["median_seconds"]
+                print(f"  {idname}: {'failed' if median is None else f'{median * 1000:.1f} ms'}", file=sys.stderr)
+            results["sizes"].append(size_result)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            results["comparison"] = compare(results, json.load(f))
+        for entry in results["comparison"]:
+            print(f"{entry['operator']} @ {entry['target_vertices']}: {entry['ratio']:.2f}x of previous", file=sys.stderr)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""Long-lived headless Blender worker that keeps the VRM addon and this enhancer loaded between jobs.
+
+Server:
+    blender --background --python vrm_job_server.py -- --port 8765
+
+Client (plain Python):
+    python vrm_job_server.py --submit job.json
+    python vrm_job_server.py --status
+
+Requests and replies are single JSON lines over a local TCP socket. A job has the same fields as a vrm_batch.py
+job: input, output, operators, settings and recipe. Jobs run one at a time on Blender's main thread and the scene is reset
+between them; connections are accepted on a background thread so status queries are answered while a job runs.
+"""
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from vrm_batch import script_args
+
+DEFAULT_PORT = 8765
+# Number of finished jobs kept for the latency figures in status replies
+LATENCY_WINDOW = 100
+
+
+class JobQueue:
+    """Pending jobs plus queue depth and latency figures for finished ones"""
+
+    def __init__(self):
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()
+        self.running = None
+        # Set by a shutdown request, after which no new jobs are accepted
+        self.closing = False
+        self.finished = 0
+        self.failed = 0
+        self.latencies = []
+        self.started = time.time()
+
+    def submit(self, job):
+        """Queues a job and returns an entry whose 'done' event is set once 'result' is filled in, None when closing"""
+        entry = {"job": job, "queued": time.perf_counter(), "done": threading.Event(), "result": None}
+        with self.lock:
+            if self.closing:
+                return None
+            self.pending.put(entry)
+        return entry
+
+    def close(self):
+        """Stops accepting jobs, the ones already queued still run before the sentinel"""
+        with self.lock:
+            if not self.closing:
+                self.closing = True
+                self.pending.put(None)
+
+    def depth(self):
+        """Queued jobs, not counting the shutdown sentinel"""
+        with self.lock:
+            return max(0, self.pending.qsize() - (1 if self.closing else 0))
+
+    def record(self, entry, result):
+        with self.lock:
+            self.running = None
+            self.finished += 1
+            self.failed += 0 if result["ok"] else 1
+            self.latencies = (self.latencies + [result["latency_seconds"]])[-LATENCY_WINDOW:]
+        entry["result"] = result
+        entry["done"].set()
+
+    def status(self):
+        depth = self.depth()
+        with self.lock:
+            latencies = sorted(self.latencies)
+            return {
+                "queue_depth": depth,
+                "closing": self.closing,
+                "running": self.running,
+                "finished": self.finished,
+                "failed": self.failed,
+                "uptime_seconds": time.time() - self.started,
+                "latency_mean_seconds": sum(latencies) / len(latencies) if latencies else None,
+                "latency_p50_seconds": latencies[len(latencies) // 2] if latencies else None,
+                "latency_max_seconds": latencies[-1] if latencies else None,
+            }
+
+
+class JobRequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request per line and answers each with one JSON line"""
+
+    def handle(self):
+        jobs = self.server.jobs
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                kind = request.get("type", "job")
+                if kind == "status":
+                    reply = jobs.status()
+                elif kind == "shutdown":
+                    jobs.close()
+                    reply = {"ok": True}
+                elif kind == "job":
+                    job = request["job"]
+                    # A malformed job would otherwise only fail once it reaches Blender's main loop
+                    if not isinstance(job, dict) or not isinstance(job.get("input"), str):
+                        raise ValueError("a job must be an object with an 'input' path")
+                    entry = jobs.submit(job)
+                    if entry is None:
+                        reply = {"ok": False, "error": "Server is shutting down"}
+                    elif not request.get("wait", True):
+                        reply = {"ok": True, "queue_depth": jobs.depth()}
+                    else:
+                        entry["done"].wait()
+                        reply = entry["result"]
+                else:
+                    reply = {"ok": False, "error": f"Unknown request type {kind}"}
+            except (ValueError, KeyError, AttributeError) as e:
+                reply = {"ok": False, "error": f"Bad request: {e}"}
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+            self.wfile.flush()
+
+
+class JobServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, jobs):
+        super().__init__(address, JobRequestHandler)
+        self.jobs = jobs
+
+
+def serve(host, port):
+    """Loads the addons once, then runs queued jobs on the main thread until a shutdown request arrives"""
+    from vrm_batch import ensure_addons, run_job
+
+    ensure_addons()
+    jobs = JobQueue()
+    server = JobServer((host, port), jobs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"VRM job server listening on {host}:{port}", flush=True)
+
+    # bpy is not thread safe, so jobs only ever run here
+    while True:
+        entry = jobs.pending.get()
+        if entry is None:
+            break
+        with jobs.lock:
+            jobs.running = entry["job"].get("input")
+        wait_seconds = time.perf_counter() - entry["queued"]
+        try:
+            result = run_job(entry["job"])
+        except Exception as e:
+            # run_job reports its own errors, anything else must not stop the server with clients still waiting
+            result = {"id": entry["job"].get("id"), "input": entry["job"].get("input"), "ok": False, "error": f"{type(e).__name__}: {e}", "seconds": time.perf_counter() - entry["queued"] - wait_seconds}
+        result["wait_seconds"] = wait_seconds
+        result["latency_seconds"] = wait_seconds + result["seconds"]
+        jobs.record(entry, result)
+        print(json.dumps(result), flush=True)
+
+    # Anything still queued never runs, fail it so clients waiting on it get an answer
+    while True:
+        try:
+            entry = jobs.pending.get_nowait()
+        except queue.Empty:
+            break
+        if entry is not None:
+            job = entry["job"]
+            jobs.record(entry, {"id": job.get("id"), "input": job.get("input"), "output": job.get("output"), "ok": False, "error": "Server shut down before the job ran", "seconds": 0.0, "latency_seconds": time.perf_counter() - entry["queued"]})
+    server.shutdown()
+    server.server_close()
+
+
+def request(host, port, payload):
+    """Sends one request to a running server and returns its reply"""
+    with socket.create_connection((host, port)) as connection:
+        connection.sendall((json.dumps(payload) + "\n").encode())
+        reply = connection.makefile('r').readline()
+    if not reply:
+        raise ConnectionError("Server closed the connection without replying")
+    return json.loads(reply)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm Blender worker for VRM Physics Enhancer jobs")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on or connect to")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on or connect to")
+    parser.add_argument("--submit", help="Client: JSON job file to run on a running server")
+    parser.add_argument("--no-wait", action="store_true", help="Client: return once the job is queued")
+    parser.add_argument("--status", action="store_true", help="Client: print queue depth and job latency")
+    parser.add_argument("--shutdown", action="store_true", help="Client: stop the server after the queued jobs")
+    args = parser.parse_args(script_args())
+
+    if args.submit:
+        with open(args.submit, 'r') as f:
+            job = json.load(f)
+        reply = request(args.host, args.port, {"type": "job", "job": job, "wait": not args.no_wait})
+    elif args.status:
+        reply = request(args.host, args.port, {"type": "status"})
+    elif args.shutdown:
+        reply = request(args.host, args.port, {"type": "shutdown"})
+    else:
+        serve(args.host, args.port)
+        return 0
+    print(json.dumps(reply, indent=1))
+    return 0 if reply.get("ok", True) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,13 @@
 import bpy
-from mathutils import Vector
+import bmesh
+from mathutils import Matrix, Vector
+from mathutils.kdtree import KDTree
 import math
+import json
+import re
+import time
+from fnmatch import fnmatchcase
+import numpy as np
 
 bl_info = {
     "name": "VRM Physics Enhancer",
@@ -253,6 +260,24 @@ bpy.types.Scene.vrm_dress_subdivision_smoothness = bpy.props.FloatProperty(
     max=1.0
 )
 
+# Limits shared by the dress and jiggle subdivision steps
+bpy.types.Scene.vrm_subdivision_vertex_budget = bpy.props.IntProperty(
+    name="Subdivision Vertex Budget",
+    description="Maximum number of vertices a subdivision step may add, longest edges are split first (0 for no limit)",
+    default=0,
+    min=0,
+    max=1000000
+)
+
+bpy.types.Scene.vrm_subdivision_max_edge_length = bpy.props.FloatProperty(
+    name="Subdivision Max Edge Length",
+    description="Only edges longer than this are split, in meters (0.0 to split every edge of the region)",
+    default=0.0,
+    min=0.0,
+    max=1.0,
+    precision=3
+)
+
 # Define scene properties for Long Dress Collision parameters
 bpy.types.Scene.vrm_dress_collider_radius = bpy.props.FloatProperty(
     name="Collider Radius",
@@ -441,6 +466,97 @@ bpy.types.Scene.vrm_breast_bone_count = bpy.props.EnumProperty(
     default='3'
 )
 
+bpy.types.Scene.vrm_breast_tweaker_engine = bpy.props.EnumProperty(
+    name="Tweaker Engine",
+    description="How the Breast Physics Tweaker computes the bust weights",
+    items=[
+        ('FUSED', "Fused", "Compute Bust2, _end and _3 weights for both sides in a single pass"),
+        ('REFERENCE', "Reference", "Separate pass per group and side, kept to compare results against"),
+    ],
+    default='FUSED'
+)
+
+bpy.types.Scene.vrm_breast_shape_mode = bpy.props.EnumProperty(
+    name="Shape Key Mode",
+    description="Which breast shape keys the Blend Shape Scaler creates",
+    items=[
+        ('SINGLE', "Flatten", "One fully flattened Breast_Flatten key, set to max value"),
+        ('FAMILY', "Family", "Graded flatten and enlarge keys from a single skinning pass, all left at 0"),
+    ],
+    default='SINGLE'
+)
+
+bpy.types.Scene.vrm_breast_flatten_steps = bpy.props.IntProperty(
+    name="Flatten Steps",
+    description="Number of graded flatten keys (4 gives 25, 50, 75 and 100%)",
+    default=4,
+    min=1,
+    max=10
+)
+
+bpy.types.Scene.vrm_breast_enlarge_scale = bpy.props.FloatVectorProperty(
+    name="Enlarge Scale",
+    description="Per-axis bust bone scale of the full enlarge key",
+    size=3,
+    default=(1.2, 1.2, 1.2),
+    min=1.0,
+    max=3.0
+)
+
+bpy.types.Scene.vrm_breast_enlarge_steps = bpy.props.IntProperty(
+    name="Enlarge Steps",
+    description="Number of graded enlarge keys (0 for none)",
+    default=2,
+    min=0,
+    max=10
+)
+
+bpy.types.Scene.vrm_diagnostics_level = bpy.props.EnumProperty(
+    name="Diagnostics",
+    description="How much detail the operators report to the Info log",
+    items=[
+        ('QUIET', "Quiet", "Only warnings and errors"),
+        ('SUMMARY', "Summary", "One summary line per phase"),
+        ('VERBOSE', "Verbose", "One summary line per phase plus per-group statistics"),
+    ],
+    default='SUMMARY'
+)
+
+bpy.types.Scene.vrm_diagnostics_dump_path = bpy.props.StringProperty(
+    name="Diagnostics File",
+    description="Optional JSON file that receives per-vertex details instead of the Info log",
+    default="",
+    subtype='FILE_PATH'
+)
+
+bpy.types.Scene.vrm_dry_run = bpy.props.BoolProperty(
+    name="Dry Run",
+    description="Plan the changes and report a summary without modifying the model",
+    default=False
+)
+
+bpy.types.Scene.vrm_recipe_path = bpy.props.StringProperty(
+    name="Recipe",
+    description="JSON or TOML file listing operator steps and the panel settings each one runs with",
+    default="",
+    subtype='FILE_PATH'
+)
+
+bpy.types.Scene.vrm_use_mirror = bpy.props.BoolProperty(
+    name="Mirror Left to Right",
+    description="Compute weights for the left side only and mirror them to the right when the mesh and bones are symmetric enough",
+    default=False
+)
+
+bpy.types.Scene.vrm_mirror_tolerance = bpy.props.FloatProperty(
+    name="Mirror Tolerance",
+    description="Maximum distance between a vertex and the reflection of its mirror partner, in meters",
+    default=0.001,
+    min=0.0,
+    max=0.05,
+    precision=4
+)
+
 # Add new scene property for physics presets
 bpy.types.Scene.vrm_breast_physics_preset = bpy.props.EnumProperty(
     name="Physics Preset",
@@ -452,6 +568,1575 @@ bpy.types.Scene.vrm_breast_physics_preset = bpy.props.EnumProperty(
     default='DISCRETE'
 )
 
+
+def vertex_groups_matching(mesh, patterns):
+    """Vertex groups of mesh whose names match any of the case-sensitive fnmatch patterns (a single pattern may be passed)"""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return [vg for vg in mesh.vertex_groups if any(fnmatchcase(vg.name, pattern) for pattern in patterns)]
+
+
+class VertexWeightMatrix:
+    """Sparse vertex x group weight matrix read from a mesh in a single pass"""
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.reload()
+
+    def reload(self):
+        # Read every vertex group membership with one walk over the vertices (no per-vertex vg.weight lookups)
+        vertices = self.mesh.data.vertices
+        self.vertex_count = len(vertices)
+        counts = np.fromiter((len(v.groups) for v in vertices), dtype=np.int64, count=self.vertex_count)
+        entries = [(g.group, g.weight) for v in vertices for g in v.groups]
+
+        # CSR layout: row v spans indptr[v]:indptr[v + 1] in group_indices/weights
+        self.indptr = np.zeros(self.vertex_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        if entries:
+            groups, weights = zip(*entries)
+        else:
+            groups, weights = (), ()
+        self.group_indices = np.array(groups, dtype=np.int32)
+        self.weights = np.array(weights, dtype=np.float32)
+        self._build_columns()
+
+    def _build_columns(self):
+        # Column view sorted by group so per-group queries are slices instead of scans
+        row_ids = np.repeat(np.arange(self.vertex_count, dtype=np.int32), np.diff(self.indptr))
+        order = np.argsort(self.group_indices, kind='stable')
+        group_count = max(len(self.mesh.vertex_groups), int(self.group_indices.max()) + 1 if self.group_indices.size else 0)
+        self._column_ptr = np.searchsorted(self.group_indices[order], np.arange(group_count + 1))
+        self._column_rows = row_ids[order]
+        self._column_weights = self.weights[order]
+        self._columns = {}
+        self._rows_stale = False
+
+    def group_index(self, group):
+        """Resolves a vertex group, its name or its index to an index (None if missing)"""
+        if isinstance(group, int):
+            return group
+        if isinstance(group, str):
+            vg = self.mesh.vertex_groups.get(group)
+            return vg.index if vg else None
+        return group.index if group else None
+
+    def members(self, group, min_weight=0.0):
+        """Returns (vertex indices, weights) of a group, keeping weights > min_weight (all members if None)"""
+        index = self.group_index(group)
+        if index is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if index in self._columns:
+            rows, weights = self._columns[index]
+        elif index + 1 < len(self._column_ptr):
+            start, end = self._column_ptr[index], self._column_ptr[index + 1]
+            rows, weights = self._column_rows[start:end], self._column_weights[start:end]
+        else:
+            rows, weights = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if min_weight is None:
+            return rows, weights
+        keep = weights > min_weight
+        return rows[keep], weights[keep]
+
+    def dense(self, group):
+        """Returns a full-length weight array for a group (0.0 for non-members)"""
+        result = np.zeros(self.vertex_count, dtype=np.float32)
+        rows, weights = self.members(group, min_weight=None)
+        result[rows] = weights
+        return result
+
+    def union_mask(self, groups, min_weight=None):
+        """Boolean mask of the vertices belonging to any of the groups (all members if min_weight is None)"""
+        mask = np.zeros(self.vertex_count, dtype=bool)
+        for group in groups:
+            mask[self.members(group, min_weight)[0]] = True
+        return mask
+
+    def row(self, vertex_index):
+        """Returns (group indices, weights) of a single vertex"""
+        if self._rows_stale:
+            self._rebuild_rows()
+        start, end = self.indptr[vertex_index], self.indptr[vertex_index + 1]
+        return self.group_indices[start:end], self.weights[start:end]
+
+    def assign(self, group, vertex_indices, weights):
+        """Mirrors a vg.add(..., 'REPLACE') into the matrix so later queries see the new weights"""
+        index = self.group_index(group)
+        if index is None:
+            return
+        vertex_indices = np.asarray(vertex_indices, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float32)
+        rows, old_weights = self.members(index, min_weight=None)
+        merged = np.concatenate([vertex_indices, rows])
+        merged_weights = np.concatenate([weights, old_weights])
+        # np.unique keeps the first occurrence, so new weights win over existing ones
+        merged, first = np.unique(merged, return_index=True)
+        self._columns[index] = (merged.astype(np.int32), merged_weights[first])
+        self._rows_stale = True
+
+    def remove(self, group, vertex_indices):
+        """Mirrors a vg.remove(...) into the matrix"""
+        index = self.group_index(group)
+        if index is None:
+            return
+        rows, weights = self.members(index, min_weight=None)
+        keep = ~np.isin(rows, np.asarray(vertex_indices))
+        self._columns[index] = (rows[keep], weights[keep])
+        self._rows_stale = True
+
+    def _rebuild_rows(self):
+        # Fold the per-group overrides back into the CSR rows
+        group_count = len(self._column_ptr) - 1
+        all_groups = set(range(group_count)) | set(self._columns)
+        rows, groups, weights = [], [], []
+        for index in sorted(all_groups):
+            member_rows, member_weights = self.members(index, min_weight=None)
+            rows.append(member_rows)
+            groups.append(np.full(len(member_rows), index, dtype=np.int32))
+            weights.append(member_weights)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+        groups = np.concatenate(groups) if groups else np.empty(0, dtype=np.int32)
+        weights = np.concatenate(weights) if weights else np.empty(0, dtype=np.float32)
+        order = np.lexsort((groups, rows))
+        self.indptr = np.zeros(self.vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.vertex_count), out=self.indptr[1:])
+        self.group_indices = groups[order]
+        self.weights = weights[order]
+        self._build_columns()
+
+
+class MeshCache:
+    """Per-run cache of mesh data shared by the operator phases"""
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self._positions = None
+        self._weights = None
+        self._writer = None
+        self._spatial_index = None
+        self._edges = None
+        self._adjacency = None
+        self._mirror_map = None
+
+    @property
+    def positions(self):
+        """World-space vertex positions as an (N, 3) float32 array"""
+        vertices = self.mesh.data.vertices
+        if self._positions is None or len(self._positions) != len(vertices):
+            # Read all coordinates in bulk and apply the world matrix once
+            co = np.empty(len(vertices) * 3, dtype=np.float32)
+            vertices.foreach_get('co', co)
+            matrix = np.array(self.mesh.matrix_world, dtype=np.float64)
+            world = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+            self._positions = world.astype(np.float32)
+        return self._positions
+
+    @property
+    def weights(self):
+        """Vertex group weights as a VertexWeightMatrix"""
+        if self._weights is None:
+            self._weights = VertexWeightMatrix(self.mesh)
+        return self._weights
+
+    @property
+    def edges(self):
+        """Edge vertex pairs as an (E, 2) int32 array"""
+        edges = self.mesh.data.edges
+        if self._edges is None or len(self._edges) != len(edges):
+            pairs = np.empty(len(edges) * 2, dtype=np.int32)
+            edges.foreach_get('vertices', pairs)
+            self._edges = pairs.reshape(-1, 2)
+        return self._edges
+
+    @property
+    def adjacency(self):
+        """VertexAdjacency built from the edge list"""
+        vertex_count = len(self.mesh.data.vertices)
+        if self._adjacency is None or self._adjacency.size != vertex_count:
+            self._adjacency = VertexAdjacency(self.edges, vertex_count)
+        return self._adjacency
+
+    def mirror_map(self, tolerance=0.001):
+        """MirrorMap over the world-space positions the weights are computed from, rebuilt when the tolerance or vertex count changes"""
+        positions = self.positions
+        if self._mirror_map is None or self._mirror_map.tolerance != tolerance or self._mirror_map.size != len(positions):
+            self._mirror_map = MirrorMap(positions, tolerance)
+        return self._mirror_map
+
+    def read_selection(self):
+        """Current vertex selection as a boolean array (never cached, operators change it)"""
+        vertices = self.mesh.data.vertices
+        selection = np.empty(len(vertices), dtype=bool)
+        vertices.foreach_get('select', selection)
+        return selection
+
+    def write_selection(self, selection):
+        """Replaces the vertex selection from Object Mode, edges and faces are cleared so Edit Mode flushes it from the vertices"""
+        data = self.mesh.data
+        data.edges.foreach_set('select', np.zeros(len(data.edges), dtype=bool))
+        data.polygons.foreach_set('select', np.zeros(len(data.polygons), dtype=bool))
+        data.vertices.foreach_set('select', np.asarray(selection, dtype=bool))
+
+    def select_groups(self, patterns, min_weight=None):
+        """Selects the union of the vertex groups matching the name patterns and returns the mask"""
+        selection = self.weights.union_mask(vertex_groups_matching(self.mesh, patterns), min_weight)
+        self.write_selection(selection)
+        return selection
+
+    @property
+    def spatial_index(self):
+        """SpatialIndex over the world-space positions"""
+        if self._spatial_index is None or self._spatial_index.size != len(self.positions):
+            self._spatial_index = SpatialIndex(self.positions)
+        return self._spatial_index
+
+    @property
+    def writer(self):
+        """Bulk WeightWriter for this mesh"""
+        if self._writer is None:
+            self._writer = WeightWriter(self)
+        return self._writer
+
+    def invalidate(self):
+        """Drops everything derived from the topology, call after adding or removing vertices"""
+        if self._writer is not None and self._writer.pending:
+            raise RuntimeError("Pending vertex weights must be committed before the mesh topology changes")
+        self._positions = None
+        self._weights = None
+        self._spatial_index = None
+        self._edges = None
+        self._adjacency = None
+        self._mirror_map = None
+
+
+class VertexAdjacency:
+    """Vertex neighbours in CSR form for ring expansion, region boundaries and connected components"""
+
+    def __init__(self, edges, vertex_count):
+        self.size = vertex_count
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.edges = edges
+        # Every edge is stored in both directions, sorted by the source vertex
+        sources = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets = np.concatenate((edges[:, 1], edges[:, 0]))
+        order = np.argsort(sources, kind='stable')
+        self.rows = sources[order]
+        self.indices = targets[order]
+        self.indptr = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=vertex_count), out=self.indptr[1:])
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def neighbors(self, v_idx):
+        return self.indices[self.indptr[v_idx]:self.indptr[v_idx + 1]]
+
+    def _as_mask(self, verts):
+        verts = np.asarray(verts)
+        if verts.dtype == bool:
+            return verts.copy()
+        mask = np.zeros(self.size, dtype=bool)
+        mask[verts.astype(np.int64)] = True
+        return mask
+
+    def k_ring(self, verts, rings=1):
+        """Boolean mask of verts grown by the given number of edge rings (verts may be indices or a mask)"""
+        mask = self._as_mask(verts)
+        for _ in range(rings):
+            grown = mask.copy()
+            grown[self.indices[mask[self.rows]]] = True
+            if np.array_equal(grown, mask):
+                break
+            mask = grown
+        return mask
+
+    def boundary(self, verts, outer=False):
+        """Vertices of the region touching a vertex outside it, or with outer=True the ring just outside it"""
+        mask = self._as_mask(verts)
+        if outer:
+            return self.k_ring(mask, 1) & ~mask
+        outside = np.bincount(self.rows, weights=(~mask[self.indices]).astype(np.float64), minlength=self.size) > 0
+        return mask & outside
+
+    def components(self, verts=None):
+        """Connected component label per vertex (numbered from 0), -1 for vertices outside verts"""
+        mask = np.ones(self.size, dtype=bool) if verts is None else self._as_mask(verts)
+        u, v = self.edges[:, 0], self.edges[:, 1]
+        inside = mask[u] & mask[v]
+        u, v = u[inside], v[inside]
+        # Hook roots onto the smallest neighbouring root, then compress paths, until no edge crosses two roots
+        parent = np.arange(self.size)
+        while True:
+            root_u, root_v = parent[u], parent[v]
+            crossing = root_u != root_v
+            if not crossing.any():
+                break
+            np.minimum.at(parent, np.maximum(root_u, root_v)[crossing], np.minimum(root_u, root_v)[crossing])
+            while True:
+                grand = parent[parent]
+                if np.array_equal(grand, parent):
+                    break
+                parent = grand
+        labels = np.full(self.size, -1, dtype=np.int64)
+        labels[mask] = np.unique(parent[mask], return_inverse=True)[1]
+        return labels
+
+
+class SpatialIndex:
+    """KD-tree over vertex positions for radius and nearest-vertex queries"""
+
+    def __init__(self, positions):
+        self.positions = positions
+        self.size = len(positions)
+        self.tree = KDTree(self.size)
+        for v_idx, co in enumerate(positions.tolist()):
+            self.tree.insert(co, v_idx)
+        self.tree.balance()
+
+    def find_range(self, center, radius):
+        """Returns the sorted indices of vertices strictly closer than radius to center"""
+        found = np.array([v_idx for _, v_idx, _ in self.tree.find_range(center, radius)], dtype=np.int64)
+        if not found.size:
+            return found
+        # The KD-tree range is inclusive, the operators always compare with a strict <
+        dist = np.linalg.norm(self.positions[found] - np.asarray(center, dtype=np.float32), axis=1)
+        return np.sort(found[dist < radius])
+
+    def find_nearest(self, point):
+        """Returns (vertex index, distance) of the vertex closest to point"""
+        _, v_idx, dist = self.tree.find(point)
+        return v_idx, dist
+
+    def find_nearest_many(self, points):
+        """Returns (indices, distances) arrays of the nearest vertex for every point"""
+        found = [self.tree.find(co) for co in np.asarray(points).tolist()]
+        indices = np.array([v_idx if v_idx is not None else -1 for _, v_idx, _ in found], dtype=np.int64)
+        distances = np.array([dist if dist is not None else np.inf for _, _, dist in found], dtype=np.float64)
+        return indices, distances
+
+
+# Share of a side that must match its mirror image before operators mirror results instead of computing them
+MIRROR_MIN_MATCH = 0.99
+
+MIRROR_NAME_PATTERN = re.compile(r"(?<=_)[LR](?=_)|Left|Right|(?<=\.)[LR]$")
+MIRROR_NAME_SWAPS = {'L': 'R', 'R': 'L', 'Left': 'Right', 'Right': 'Left'}
+
+
+def mirror_name(name):
+    """Swaps the side of a bone or group name: _L_ and _R_, Left and Right, .L and .R"""
+    return MIRROR_NAME_PATTERN.sub(lambda match: MIRROR_NAME_SWAPS[match.group(0)], name)
+
+
+class MirrorMap:
+    """Left/right vertex pairs, found by looking up every vertex reflected across X in a KD-tree"""
+
+    def __init__(self, positions, tolerance=0.001):
+        self.tolerance = tolerance
+        self.size = len(positions)
+        reflected = positions * np.array([-1.0, 1.0, 1.0], dtype=positions.dtype)
+        nearest, dist = SpatialIndex(positions).find_nearest_many(reflected)
+        self.pairs = np.where(dist <= tolerance, nearest, -1)
+        self.matched = int(np.count_nonzero(self.pairs >= 0))
+
+    def mirror(self, verts):
+        """Mirror partner of every vertex, -1 where there is none"""
+        return self.pairs[np.asarray(verts, dtype=np.int64)]
+
+    def mirror_weights(self, verts, weights):
+        """Moves weights to the mirror partners, returning (verts, weights, unmatched count)"""
+        partners = self.mirror(verts)
+        keep = partners >= 0
+        return partners[keep], np.asarray(weights)[keep], int(np.count_nonzero(~keep))
+
+    def region_mismatch(self, verts, other_verts):
+        """Vertices of either region that have no counterpart in the other one"""
+        partners = self.mirror(verts)
+        mirrored = partners[partners >= 0]
+        return int(np.count_nonzero(partners < 0)) + int(np.setxor1d(mirrored, other_verts).size)
+
+    def group_mismatch(self, weight_matrix, group, other_group, weight_tolerance=1e-3):
+        """(vertices without a matching mirrored weight, vertices compared) between two vertex groups"""
+        verts, weights = weight_matrix.members(group)
+        other_verts = weight_matrix.members(other_group)[0]
+        other_dense = weight_matrix.dense(other_group)
+        partners = self.mirror(verts)
+        matched = partners >= 0
+        differs = ~matched
+        differs[matched] = np.abs(other_dense[partners[matched]] - weights[matched]) > weight_tolerance
+        extra = np.setdiff1d(other_verts, partners[matched]).size
+        return int(np.count_nonzero(differs)) + int(extra), max(len(verts), len(other_verts))
+
+    def points_mirrored(self, point, other_point):
+        """Whether other_point is point reflected across X, such as the centres of a left and right bone"""
+        reflected = np.asarray(point, dtype=np.float64) * np.array([-1.0, 1.0, 1.0])
+        return float(np.linalg.norm(reflected - np.asarray(other_point, dtype=np.float64))) <= self.tolerance
+
+    def symmetric_enough(self, mismatch, total):
+        return mismatch <= (1.0 - MIRROR_MIN_MATCH) * max(total, 1)
+
+
+class WeightWriter:
+    """Collects REPLACE weight assignments and writes them back in bulk"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._pending = []
+        self.weights_written = 0
+        self.rna_calls = 0
+
+    @property
+    def pending(self):
+        return sum(len(vertex_indices) for _, vertex_indices, _ in self._pending)
+
+    def remove(self, vertex_group, vertex_indices):
+        """Queues vertex_group.remove(...) for the given vertices"""
+        vertex_indices = np.asarray(vertex_indices, dtype=np.int64)
+        if not vertex_indices.size:
+            return
+        self._pending.append((vertex_group, vertex_indices, None))
+        if self.cache._weights is not None:
+            self.cache._weights.remove(vertex_group, vertex_indices)
+
+    @property
+    def rna_calls_saved(self):
+        """RNA calls avoided compared with one vg.add per vertex"""
+        return self.weights_written - self.rna_calls
+
+    def summary(self):
+        return f"Wrote {self.weights_written} weights with {self.rna_calls} RNA call(s), {self.rna_calls_saved} fewer than per-vertex assignment"
+
+    def add(self, vertex_group, vertex_indices, weights):
+        """Queues vertex_group.add(..., 'REPLACE') for every vertex/weight pair"""
+        vertex_indices = np.asarray(vertex_indices, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float32)
+        if not vertex_indices.size:
+            return
+        self._pending.append((vertex_group, vertex_indices, weights))
+        # Keep an already loaded weight matrix in step so later phases read the new weights
+        if self.cache._weights is not None:
+            self.cache._weights.assign(vertex_group, vertex_indices, weights)
+
+    def pending_groups(self):
+        """{group name: (weights set, vertices removed)} of the queued writes"""
+        groups = {}
+        for vertex_group, vertex_indices, weights in self._pending:
+            added, removed = groups.get(vertex_group.name, (0, 0))
+            groups[vertex_group.name] = (added, removed + len(vertex_indices)) if weights is None else (added + len(vertex_indices), removed)
+        return groups
+
+    def resolve_groups(self, vertex_groups):
+        """Swaps queued PlannedVertexGroups for the vertex groups created for them"""
+        self._pending = [(vertex_groups[vertex_group.name] if isinstance(vertex_group, PlannedVertexGroup) else vertex_group, vertex_indices, weights)
+                         for vertex_group, vertex_indices, weights in self._pending]
+
+    def discard(self):
+        """Drops the queued writes, the weight matrix is read again from the mesh on next use"""
+        self._pending = []
+        self.cache._weights = None
+
+    def commit(self, method='AUTO'):
+        """Writes all queued weights through equal-weight buckets or the bmesh deform layer"""
+        if not self._pending:
+            return 0
+        total = self.pending
+        if method == 'AUTO':
+            # Buckets pay off when many vertices share a weight, otherwise one bmesh round-trip is cheaper
+            buckets = sum(1 if weights is None else len(np.unique(weights)) for _, _, weights in self._pending)
+            method = 'BUCKET' if buckets * 4 <= total else 'BMESH'
+
+        calls = 0
+        if method == 'BUCKET':
+            for vertex_group, vertex_indices, weights in self._pending:
+                if weights is None:
+                    vertex_group.remove(vertex_indices.tolist())
+                    calls += 1
+                    continue
+                values, inverse = np.unique(weights, return_inverse=True)
+                order = np.argsort(inverse, kind='stable')
+                splits = np.cumsum(np.bincount(inverse))[:-1]
+                for value, bucket in zip(values.tolist(), np.split(vertex_indices[order], splits)):
+                    vertex_group.add(bucket.tolist(), value, 'REPLACE')
+                    calls += 1
+        else:
+            mesh_data = self.cache.mesh.data
+            bm = bmesh.new()
+            bm.from_mesh(mesh_data)
+            deform = bm.verts.layers.deform.verify()
+            bm.verts.ensure_lookup_table()
+            for vertex_group, vertex_indices, weights in self._pending:
+                group_index = vertex_group.index
+                if weights is None:
+                    for v_idx in vertex_indices.tolist():
+                        dvert = bm.verts[v_idx][deform]
+                        if group_index in dvert:
+                            del dvert[group_index]
+                    continue
+                for v_idx, weight in zip(vertex_indices.tolist(), weights.tolist()):
+                    bm.verts[v_idx][deform][group_index] = weight
+            bm.to_mesh(mesh_data)
+            bm.free()
+            mesh_data.update()
+            calls = 1
+
+        self.weights_written += total
+        self.rna_calls += calls
+        self._pending = []
+        return calls
+
+
+def smooth_weights(weights, adjacency, factor=0.5, repeat=3, expand=0.0, mask=None):
+    """Laplacian smoothing of one dense weight array with vertex_group_smooth's factor/repeat/expand semantics"""
+    weights = np.asarray(weights, dtype=np.float64)
+    vertex_count = len(weights)
+    rows, neighbors = adjacency.rows, adjacency.indices
+    # Only writable vertices with at least one neighbour change, like the operator with use_paint_mask_vertex
+    writable = np.ones(vertex_count, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    used = writable & (adjacency.degree > 0)
+    iexpand = 1.0 - abs(expand)
+
+    prev = weights.copy()
+    for _ in range(repeat):
+        # expand > 0 weakens the pull of lighter neighbours (weights grow), expand < 0 that of heavier ones
+        if expand > 0.0:
+            pull = np.where(prev[neighbors] < prev[rows], iexpand, 1.0)
+        elif expand < 0.0:
+            pull = np.where(prev[neighbors] > prev[rows], iexpand, 1.0)
+        else:
+            pull = np.ones(len(rows))
+        accum = np.bincount(rows, weights=pull * prev[neighbors], minlength=vertex_count)
+        total = np.bincount(rows, weights=pull, minlength=vertex_count)
+        update = used & (total != 0.0)
+        curr = prev.copy()
+        curr[update] = np.clip(prev[update] * (1.0 - factor) + (accum[update] / total[update]) * factor, 0.0, 1.0)
+        prev = curr
+    return prev
+
+
+def smooth_vertex_groups(cache, vertex_groups, factor=0.5, repeat=3, expand=0.0, use_selection=True):
+    """Smooths several vertex groups in memory, without Weight Paint mode, and queues the results on the writer"""
+    mask = cache.read_selection() if use_selection else None
+    adjacency = cache.adjacency
+    for vertex_group in vertex_groups:
+        before = cache.weights.dense(vertex_group)
+        after = smooth_weights(before, adjacency, factor, repeat, expand, mask).astype(np.float32)
+        changed = after != before
+        # Weights that reach zero leave the group, the same way the operator removes them
+        cache.writer.add(vertex_group, np.flatnonzero(changed & (after > 0.0)), after[changed & (after > 0.0)])
+        cache.writer.remove(vertex_group, np.flatnonzero(changed & (after <= 0.0)))
+
+
+class Diagnostics:
+    """Aggregates per-group statistics and reports one summary per phase instead of one line per vertex"""
+
+    def __init__(self, operator, level='SUMMARY', dump_path=""):
+        self.operator = operator
+        self.level = level
+        self.dump_path = dump_path
+        self.phases = []
+        self._phase = None
+
+    @classmethod
+    def from_scene(cls, operator, scene):
+        return cls(operator, scene.vrm_diagnostics_level, scene.vrm_diagnostics_dump_path)
+
+    def begin_phase(self, name):
+        """Closes the current phase and starts collecting a new one"""
+        self.end_phase()
+        self._phase = {"name": name, "groups": {}, "start": time.perf_counter()}
+
+    def record(self, group_name, vertex_indices, weights, distances=None):
+        """Adds the weights assigned to a group in the current phase"""
+        if self._phase is None:
+            self.begin_phase("Default")
+        weights = np.asarray(weights, dtype=np.float64)
+        stats = self._phase["groups"].setdefault(group_name, {"count": 0, "min": None, "max": None, "histogram": [0] * 10, "vertices": []})
+        stats["count"] += len(weights)
+        if len(weights):
+            stats["min"] = float(weights.min()) if stats["min"] is None else min(stats["min"], float(weights.min()))
+            stats["max"] = float(weights.max()) if stats["max"] is None else max(stats["max"], float(weights.max()))
+            histogram, _ = np.histogram(weights, bins=10, range=(0.0, 1.0))
+            stats["histogram"] = [a + b for a, b in zip(stats["histogram"], histogram.tolist())]
+        # Per-vertex detail is only kept when it goes to a file
+        if self.dump_path:
+            distances = [None] * len(weights) if distances is None else np.asarray(distances).tolist()
+            for v_idx, weight, dist in zip(np.asarray(vertex_indices).tolist(), weights.tolist(), distances):
+                stats["vertices"].append({"index": v_idx, "weight": weight, "distance": dist})
+
+    def end_phase(self):
+        """Finishes the current phase and emits its summary"""
+        phase = self._phase
+        if phase is None:
+            return
+        self._phase = None
+        phase["seconds"] = time.perf_counter() - phase.pop("start")
+        self.phases.append(phase)
+        if self.level == 'QUIET':
+            return
+        groups = phase["groups"]
+        total = sum(stats["count"] for stats in groups.values())
+        mins = [stats["min"] for stats in groups.values() if stats["min"] is not None]
+        maxs = [stats["max"] for stats in groups.values() if stats["max"] is not None]
+        weight_range = f", weights {min(mins):.3f}-{max(maxs):.3f}" if mins else ""
+        self.operator.report({'INFO'}, f"{phase['name']}: {total} vertices in {len(groups)} group(s){weight_range} ({phase['seconds'] * 1000:.1f} ms)")
+        if self.level == 'VERBOSE':
+            for group_name, stats in groups.items():
+                if stats["count"]:
+                    self.operator.report({'INFO'}, f"  {group_name}: {stats['count']} vertices, weights {stats['min']:.3f}-{stats['max']:.3f}, histogram {stats['histogram']}")
+
+    def finish(self):
+        """Closes the last phase and writes the JSON dump if a path is set"""
+        self.end_phase()
+        if not self.dump_path:
+            return
+        path = bpy.path.abspath(self.dump_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"operator": self.operator.bl_idname, "phases": self.phases}, f, indent=1)
+        self.operator.report({'INFO'}, f"Diagnostics written to {path}")
+
+
+class ModeSession:
+    """Switches object modes only when needed and creates queued edit bones in a single EDIT session"""
+
+    def __init__(self, operator=None):
+        self.operator = operator
+        self.switches = 0
+        self.skipped = 0
+        self._bone_specs = []
+
+    def set(self, obj, mode):
+        """Makes obj the active object in the given mode, calling mode_set only if something changes"""
+        view_layer = bpy.context.view_layer
+        active = view_layer.objects.active
+        if active is not obj:
+            # mode_set acts on the active object, so the previous one goes back to OBJECT mode first
+            if active is not None and active.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
+                self.switches += 1
+            view_layer.objects.active = obj
+        if obj.mode == mode:
+            self.skipped += 1
+            return
+        bpy.ops.object.mode_set(mode=mode)
+        self.switches += 1
+
+    def queue_bone(self, armature, name, parent, head_factor=1.0, offset=(0.0, 0.0, 0.0), length_factor=1.0):
+        """Queues a deform bone along its parent: the head sits at head_factor of the parent plus offset,
+        the tail follows the parent direction for length_factor of its length"""
+        if name in armature.data.bones or any(spec["name"] == name for spec in self._bone_specs):
+            return False
+        self._bone_specs.append({"armature": armature, "name": name, "parent": parent, "head_factor": head_factor, "offset": offset, "length_factor": length_factor})
+        return True
+
+    def queued_bones(self):
+        return [spec["name"] for spec in self._bone_specs]
+
+    def discard_bones(self):
+        self._bone_specs = []
+
+    def flush_bones(self):
+        """Creates every queued bone in one EDIT session and returns their names"""
+        created = []
+        if not self._bone_specs:
+            return created
+        armature = self._bone_specs[0]["armature"]
+        self.set(armature, 'EDIT')
+        edit_bones = armature.data.edit_bones
+        # Specs are created in order, so a queued bone can be the parent of a later one
+        for spec in self._bone_specs:
+            parent = edit_bones.get(spec["parent"])
+            if parent is None:
+                if self.operator:
+                    self.operator.report({'WARNING'}, f"Bone {spec['parent']} not found")
+                continue
+            direction = (parent.tail - parent.head).normalized()
+            bone = edit_bones.new(spec["name"])
+            bone.head = parent.head + (parent.tail - parent.head) * spec["head_factor"] + Vector(spec["offset"])
+            bone.tail = bone.head + direction * (parent.length * spec["length_factor"])
+            bone.parent = parent
+            bone.use_deform = True
+            created.append(spec["name"])
+        self._bone_specs = []
+        self.set(armature, 'OBJECT')
+        return created
+
+    def summary(self):
+        return f"{self.switches} mode switch(es), {self.skipped} redundant switch(es) skipped"
+
+
+def classify_to_bone_segments(points, heads, tails, max_distance, decay_factor):
+    """Finds the nearest bone segment of every point, returning (index, distance, falloff weight, all distances)"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    heads = np.asarray(heads, dtype=np.float64).reshape(-1, 3)
+    tails = np.asarray(tails, dtype=np.float64).reshape(-1, 3)
+    axis = tails - heads
+    length = np.linalg.norm(axis, axis=1)
+    direction = axis / np.where(length > 0.0, length, 1.0)[:, None]
+
+    # Project every point onto every segment and clamp to the segment ends
+    relative = points[:, None, :] - heads[None, :, :]
+    t = np.clip(np.einsum('nsk,sk->ns', relative, direction), 0.0, length[None, :])
+    closest = heads[None, :, :] + t[:, :, None] * direction[None, :, :]
+    segment_dist = np.linalg.norm(points[:, None, :] - closest, axis=2)
+
+    nearest = np.argmin(segment_dist, axis=1) if len(heads) else np.zeros(len(points), dtype=np.int64)
+    nearest_dist = segment_dist[np.arange(len(points)), nearest] if len(heads) else np.full(len(points), np.inf)
+    # exp(-distance / decay_factor) falloff, nothing beyond max_distance
+    weights = np.clip(np.exp(-nearest_dist / decay_factor), 0.0, 1.0)
+    weights[nearest_dist > max_distance] = 0.0
+    return nearest, nearest_dist, weights, segment_dist
+
+
+class SpringBoneIndex:
+    """Index of spring_bone1 springs, joints, colliders and collider groups, built once per run.
+    Entries are kept as collection positions, adding items can move the existing ones in memory."""
+
+    CATEGORY_KEYWORDS = {
+        'HAIR': ("Hair",),
+        'SKIRT': ("Skirt",),
+        'BUST': ("Bust", "Breast"),
+    }
+
+    def __init__(self, spring_bone):
+        self.spring_bone = spring_bone
+        self.reload()
+
+    @classmethod
+    def from_armature(cls, armature):
+        return cls(armature.data.vrm_addon_extension.spring_bone1)
+
+    def reload(self):
+        self._categories = {category: [] for category in list(self.CATEGORY_KEYWORDS) + ['CUSTOM']}
+        self._spring_joints = []
+        self._joint_bones = []
+        self._joints_by_bone = {}
+        self._colliders_by_bone = {}
+        self._colliders_by_name = {}
+        self._groups_by_name = {}
+        for spring_pos, spring in enumerate(self.spring_bone.springs):
+            self._index_spring(spring_pos, spring)
+        for collider_pos, collider in enumerate(self.spring_bone.colliders):
+            self._index_collider(collider_pos, collider)
+        for group_pos, group in enumerate(self.spring_bone.collider_groups):
+            self._groups_by_name.setdefault(group.vrm_name, group_pos)
+
+    @classmethod
+    def categories_of(cls, spring_name):
+        """Categories a spring name falls into, a name can match several (CUSTOM if none)"""
+        categories = [category for category, keywords in cls.CATEGORY_KEYWORDS.items() if any(k in spring_name for k in keywords)]
+        return categories or ['CUSTOM']
+
+    def _index_spring(self, spring_pos, spring):
+        for category in self.categories_of(spring.vrm_name):
+            self._categories[category].append(spring_pos)
+        self._spring_joints.append({})
+        self._joint_bones.append([])
+        for joint_pos, joint in enumerate(spring.joints):
+            self._index_joint(spring_pos, joint_pos, joint.node.bone_name)
+
+    def _index_joint(self, spring_pos, joint_pos, bone_name):
+        self._joint_bones[spring_pos].append(bone_name)
+        self._spring_joints[spring_pos].setdefault(bone_name, []).append(joint_pos)
+        self._joints_by_bone.setdefault(bone_name, []).append((spring_pos, joint_pos))
+
+    def _index_collider(self, collider_pos, collider):
+        self._colliders_by_bone.setdefault(collider.node.bone_name, []).append(collider_pos)
+        name = getattr(collider, 'name', "")
+        if name:
+            self._colliders_by_name.setdefault(name, collider_pos)
+
+    def all_springs(self):
+        return list(enumerate(self.spring_bone.springs))
+
+    def springs(self, category):
+        """(position, spring) pairs of a category: HAIR, SKIRT, BUST or CUSTOM"""
+        springs = self.spring_bone.springs
+        return [(spring_pos, springs[spring_pos]) for spring_pos in self._categories[category]]
+
+    def spring_bones(self, spring_pos):
+        """Bone names with a joint in the spring"""
+        return list(self._spring_joints[spring_pos])
+
+    def joint_bone_names(self, spring_pos):
+        """Bone name of every joint of the spring, in joint order"""
+        return list(self._joint_bones[spring_pos])
+
+    def spring_joints(self, spring_pos, bone_name):
+        """Joints of one spring on the given bone"""
+        joints = self.spring_bone.springs[spring_pos].joints
+        return [joints[joint_pos] for joint_pos in self._spring_joints[spring_pos].get(bone_name, [])]
+
+    def joints(self, bone_name):
+        """(spring, joint) pairs of every joint on the given bone"""
+        springs = self.spring_bone.springs
+        return [(springs[spring_pos], springs[spring_pos].joints[joint_pos]) for spring_pos, joint_pos in self._joints_by_bone.get(bone_name, [])]
+
+    def colliders(self, bone_name):
+        """Colliders attached to the given bone"""
+        colliders = self.spring_bone.colliders
+        return [colliders[collider_pos] for collider_pos in self._colliders_by_bone.get(bone_name, [])]
+
+    def collider_positions(self, bone_name):
+        """Positions of the colliders attached to the given bone"""
+        return list(self._colliders_by_bone.get(bone_name, []))
+
+    def collider(self, name):
+        """Collider referenced by a collider group entry, by collider name or else by bone name"""
+        collider_pos = self._colliders_by_name.get(name)
+        if collider_pos is None:
+            collider_pos = next(iter(self._colliders_by_bone.get(name, [])), None)
+        return self.spring_bone.colliders[collider_pos] if collider_pos is not None else None
+
+    def group(self, name):
+        group_pos = self._groups_by_name.get(name)
+        return self.spring_bone.collider_groups[group_pos] if group_pos is not None else None
+
+    def add_spring(self, name):
+        """Adds a spring and returns its position"""
+        spring = self.spring_bone.springs.add()
+        spring.vrm_name = name
+        spring_pos = len(self.spring_bone.springs) - 1
+        self._index_spring(spring_pos, spring)
+        return spring_pos
+
+    def add_joint(self, spring_pos, bone_name):
+        joints = self.spring_bone.springs[spring_pos].joints
+        joint = joints.add()
+        joint.node.bone_name = bone_name
+        self._index_joint(spring_pos, len(joints) - 1, bone_name)
+        return joint
+
+    def add_collider(self, bone_name, shape_type=None):
+        collider = self.spring_bone.colliders.add()
+        collider.node.bone_name = bone_name
+        if shape_type:
+            collider.shape_type = shape_type
+        self._index_collider(len(self.spring_bone.colliders) - 1, collider)
+        return collider
+
+    def add_collider_group(self, name, collider_names=()):
+        group = self.spring_bone.collider_groups.add()
+        group.vrm_name = name
+        for collider_name in collider_names:
+            group.colliders.add().collider_name = collider_name
+        self._groups_by_name.setdefault(name, len(self.spring_bone.collider_groups) - 1)
+        return group
+
+    def add_spring_collider_group(self, spring_pos, group_name):
+        self.spring_bone.springs[spring_pos].collider_groups.add().collider_group_name = group_name
+
+
+# VRoid bone names: J_Bip_{side}_{part} and J_Sec_{side}_{chain}{row}_{segment}[_end], the side is optional for hair
+VROID_BONE_PATTERN = re.compile(r"^J_(?P<kind>Bip|Sec|Adj|Opt)_(?:(?P<side>[CLR])_)?(?P<chain>[A-Za-z]+?)(?P<row>\d+)?(?P<end>_end)?(?:_(?P<segment>\d+))?(?P<end_after>_end)?$")
+
+
+def parse_vroid_bone_name(name):
+    """Splits a VRoid bone or vertex group name into kind, side, chain, row, segment and end (None if it is not one)"""
+    match = VROID_BONE_PATTERN.match(name)
+    if not match:
+        return None
+    return {
+        "kind": match.group("kind"),
+        "side": match.group("side"),
+        "chain": match.group("chain"),
+        "row": int(match.group("row")) if match.group("row") is not None else None,
+        "segment": int(match.group("segment")) if match.group("segment") is not None else None,
+        "end": bool(match.group("end") or match.group("end_after")),
+    }
+
+
+class ArmatureIndex:
+    """Bone lookup by name and VRoid name parts, with world-space bone geometry as NumPy arrays, built once per run"""
+
+    def __init__(self, armature):
+        self.armature = armature
+        bones = armature.data.bones
+        self.names = [bone.name for bone in bones]
+        self._indices = {name: bone_idx for bone_idx, name in enumerate(self.names)}
+
+        # Rest heads and tails in armature space, moved to world space with one matrix multiply
+        count = len(bones)
+        heads = np.empty(count * 3, dtype=np.float32)
+        tails = np.empty(count * 3, dtype=np.float32)
+        bones.foreach_get('head_local', heads)
+        bones.foreach_get('tail_local', tails)
+        matrix = np.array(armature.matrix_world, dtype=np.float64)
+        self.heads = heads.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        self.tails = tails.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        axis = self.tails - self.heads
+        self.lengths = np.linalg.norm(axis, axis=1)
+        self.directions = axis / np.where(self.lengths > 0.0, self.lengths, 1.0)[:, None]
+
+        # VRoid names grouped by (kind, side, chain, row), each chain sorted by segment
+        self.parsed = {}
+        self._chains = {}
+        for bone_idx, name in enumerate(self.names):
+            parts = parse_vroid_bone_name(name)
+            if parts is None:
+                continue
+            self.parsed[name] = parts
+            key = (parts["kind"], parts["side"], parts["chain"], parts["row"])
+            self._chains.setdefault(key, []).append((parts["end"], parts["segment"] or 0, bone_idx))
+        for chain in self._chains.values():
+            chain.sort()
+
+    def __contains__(self, name):
+        return name in self._indices
+
+    def index(self, name):
+        return self._indices.get(name)
+
+    def head(self, name):
+        return self.heads[self._indices[name]]
+
+    def tail(self, name):
+        return self.tails[self._indices[name]]
+
+    def center(self, name):
+        bone_idx = self._indices[name]
+        return (self.heads[bone_idx] + self.tails[bone_idx]) / 2
+
+    def length(self, name):
+        return float(self.lengths[self._indices[name]])
+
+    def chain(self, kind, side, chain, row=None, include_end=False):
+        """Bone names of one chain in segment order"""
+        return [self.names[bone_idx] for end, _, bone_idx in self._chains.get((kind, side, chain, row), []) if include_end or not end]
+
+    def resolve(self, name):
+        """The bone for a bone or vertex group name: the exact bone if present, else the first segment of the same chain row"""
+        if name in self._indices:
+            return name
+        parts = parse_vroid_bone_name(name)
+        if parts is None:
+            return None
+        bones = self.chain(parts["kind"], parts["side"], parts["chain"], parts["row"], include_end=parts["end"])
+        return bones[0] if bones else None
+
+
+class BoneSkinning:
+    """CPU linear blend skinning of only the vertices weighted to a set of bones, for shape keys that pose those bones"""
+
+    def __init__(self, mesh, armature, bone_names, cache=None):
+        self.mesh = mesh
+        self.armature = armature
+        bones = armature.data.bones
+        # Parents first, so each pose matrix can build on its parent's
+        self.bone_names = sorted((name for name in bone_names if name in bones), key=lambda name: len(bones[name].parent_recursive))
+        weights = (cache or MeshCache(mesh)).weights
+
+        # The armature modifier divides by the total weight of every group that has a deforming bone
+        deforming = np.array([vg.name in bones and bones[vg.name].use_deform for vg in mesh.vertex_groups] + [False])
+        entry_rows = np.repeat(np.arange(weights.vertex_count), np.diff(weights.indptr))
+        counted = deforming[np.minimum(weights.group_indices, len(deforming) - 1)]
+        total = np.bincount(entry_rows[counted], weights=weights.weights[counted], minlength=weights.vertex_count)
+
+        members = [(name, *weights.members(name)) for name in self.bone_names if bones[name].use_deform]
+        members = [(name, rows, bone_weights) for name, rows, bone_weights in members if len(rows)]
+        self.verts = np.unique(np.concatenate([rows for _, rows, _ in members] + [np.empty(0, dtype=np.int32)]))
+        self._members = [(name, np.searchsorted(self.verts, rows), bone_weights / total[rows]) for name, rows, bone_weights in members]
+
+        # Rest coordinates come from the basis key when there is one
+        self.basis = self._read_basis()
+        self.rest = self.basis[self.verts].astype(np.float64)
+        self.mesh_to_armature = np.array(armature.matrix_world.inverted() @ mesh.matrix_world, dtype=np.float64)
+
+    def _read_basis(self):
+        data = self.mesh.data
+        source = data.shape_keys.reference_key.data if data.shape_keys else data.vertices
+        co = np.empty(len(source) * 3, dtype=np.float32)
+        source.foreach_get('co', co)
+        return co.reshape(-1, 3)
+
+    def pose_matrices(self, scale):
+        """Pose-space matrices of the bones scaled to scale from rest, every other bone stays in rest pose"""
+        bones = self.armature.data.bones
+        matrices = {}
+        for name in self.bone_names:
+            bone = bones[name]
+            # Only the scale, so any pose the bones are in is not baked into the shape keys
+            basis = Matrix.LocRotScale(None, None, Vector(scale))
+            if bone.parent is None:
+                matrices[name] = bone.convert_local_to_pose(basis, bone.matrix_local)
+            else:
+                parent_pose = matrices.get(bone.parent.name, bone.parent.matrix_local)
+                matrices[name] = bone.convert_local_to_pose(basis, bone.matrix_local, parent_matrix=parent_pose, parent_matrix_local=bone.parent.matrix_local)
+        return matrices
+
+    def offsets(self, scale):
+        """Mesh-space offsets of self.verts when the bones are scaled to scale"""
+        bones = self.armature.data.bones
+        matrices = self.pose_matrices(scale)
+        armature_to_mesh = np.linalg.inv(self.mesh_to_armature)
+        offsets = np.zeros_like(self.rest)
+        for name, local, bone_weights in self._members:
+            skin = armature_to_mesh @ np.array(matrices[name] @ bones[name].matrix_local.inverted(), dtype=np.float64) @ self.mesh_to_armature
+            rest = self.rest[local]
+            moved = rest @ skin[:3, :3].T + skin[:3, 3]
+            np.add.at(offsets, local, (moved - rest) * bone_weights[:, None])
+        return offsets
+
+    def write_shape_key(self, name, offsets, value=1.0):
+        """Writes basis + offsets into the named shape key (created, with a basis, if missing) in one foreach_set"""
+        if not self.mesh.data.shape_keys:
+            self.mesh.shape_key_add(name="Basis", from_mix=False)
+        key = self.mesh.data.shape_keys.key_blocks.get(name)
+        if key is None:
+            key = self.mesh.shape_key_add(name=name, from_mix=False)
+        co = self.basis.copy()
+        co[self.verts] += offsets.astype(np.float32)
+        key.data.foreach_set('co', co.ravel())
+        key.value = value
+        return key
+
+    def family(self, name, offsets, steps):
+        """(key name, offsets) of steps graded keys from one set of full offsets (name_25, name_50, ... and name at 100%),
+        each one only scales the shared offsets"""
+        keys = []
+        for step in range(1, steps + 1):
+            fraction = step / steps
+            keys.append((name if step == steps else f"{name}_{round(fraction * 100)}", offsets * fraction))
+        return keys
+
+
+
+# (stiffness, drag_force) scale exponents of the bust joints, every other joint uses S^1.4 for both
+BUST_SCALE_EXPONENTS = {
+    "J_Sec_L_Bust1": (0.9, 0.001), "J_Sec_L_Bust2": (0.9, 0.001), "J_Sec_R_Bust1": (0.9, 0.001), "J_Sec_R_Bust2": (0.9, 0.001),
+    "J_Sec_L_Bust2_end": (0.8, 0.2), "J_Sec_R_Bust2_end": (0.8, 0.2),
+    "J_Sec_L_Bust3": (0.7, 0.1), "J_Sec_R_Bust3": (0.7, 0.1),
+}
+
+
+def scale_spring_bone_physics(spring_index, scale_factor):
+    """Scales every joint and collider exactly once for a model scaled by scale_factor.
+    Returns (joints, colliders) touched."""
+    joint_count = 0
+    for spring_pos, spring in spring_index.all_springs():
+        joints = spring.joints
+        count = len(joints)
+        if not count:
+            continue
+        exponents = np.array([BUST_SCALE_EXPONENTS.get(bone, (1.4, 1.4)) for bone in spring_index.joint_bone_names(spring_pos)], dtype=np.float64)
+        # Read, scale and write each joint parameter of the spring in bulk, gravity_power stays unchanged
+        for attribute, factors in (('stiffness', scale_factor ** exponents[:, 0]), ('drag_force', scale_factor ** exponents[:, 1]), ('radius', np.full(count, scale_factor))):
+            values = np.empty(count, dtype=np.float32)
+            joints.foreach_get(attribute, values)
+            joints.foreach_set(attribute, (values * factors).astype(np.float32))
+        joint_count += count
+
+    # Colliders live in bone space, so radius, offset and tail all scale linearly
+    colliders = spring_index.spring_bone.colliders
+    for collider in colliders:
+        shape = collider.shape.capsule if collider.shape_type == "Capsule" else collider.shape.sphere
+        shape.radius *= scale_factor
+        shape.offset = [value * scale_factor for value in shape.offset]
+        if collider.shape_type == "Capsule":
+            shape.tail = [value * scale_factor for value in shape.tail]
+    return joint_count, len(colliders)
+
+
+# Joint parameters with more than one float per joint
+JOINT_VECTOR_ATTRIBUTES = {"gravity_dir": 3}
+
+
+def evaluate_profile(profile, depth, current=None):
+    """Values of one joint parameter for every chain depth: a constant, a table by depth (the last
+    entry repeats for deeper joints) or a callable(depth, current) returning the values"""
+    if callable(profile):
+        return np.asarray(profile(depth, current), dtype=np.float64)
+    width = current.shape[1] if current is not None and current.ndim == 2 else 1
+    table = np.asarray(profile, dtype=np.float64).reshape(-1, width)
+    values = table[np.minimum(depth, len(table) - 1)]
+    return values if width > 1 else values[:, 0]
+
+
+def apply_joint_profile(springs, profile):
+    """Writes a {attribute: profile} dict to every joint of the (position, spring) pairs in bulk, returns the joints written"""
+    written = 0
+    for _, spring in springs:
+        joints = spring.joints
+        count = len(joints)
+        if not count:
+            continue
+        depth = np.arange(count)
+        for attribute, attribute_profile in profile.items():
+            width = JOINT_VECTOR_ATTRIBUTES.get(attribute, 1)
+            current = np.empty(count * width, dtype=np.float32)
+            joints.foreach_get(attribute, current)
+            current = current.reshape(count, width) if width > 1 else current
+            values = evaluate_profile(attribute_profile, depth, current)
+            joints.foreach_set(attribute, np.asarray(values, dtype=np.float32).ravel())
+        written += count
+    return written
+
+
+def skirt_joint_profile(scene):
+    """Skirt joint parameters by chain depth from the scene properties"""
+    return {
+        "radius": [scene.vrm_skirt_hit_radius_first, scene.vrm_skirt_hit_radius_second, scene.vrm_skirt_hit_radius_third, scene.vrm_skirt_hit_radius_fourth],
+        "drag_force": np.clip([scene.vrm_skirt_drag_force_first, scene.vrm_skirt_drag_force_second, scene.vrm_skirt_drag_force_third, scene.vrm_skirt_drag_force_fourth, scene.vrm_skirt_drag_force_fifth], 0.0, 1.0),
+        "stiffness": [scene.vrm_skirt_stiffness_first, scene.vrm_skirt_stiffness_second, scene.vrm_skirt_stiffness_third, scene.vrm_skirt_stiffness_fourth],
+        "angular_stiffness": np.clip([scene.vrm_skirt_angular_stiffness_first, scene.vrm_skirt_angular_stiffness_second, scene.vrm_skirt_angular_stiffness_third, scene.vrm_skirt_angular_stiffness_fourth], 0.3, 1.0),
+        "gravity_power": [scene.vrm_skirt_gravity_power_first, scene.vrm_skirt_gravity_power_rest],
+    }
+
+
+def predict_subdivision(edges):
+    """Number of vertices bmesh.ops.subdivide_edges adds for one cut of the given edges
+    (grid fill and inner corner vertices included)"""
+    cut = set(edges)
+    inner = 0
+    for face in {face for edge in cut for face in edge.link_faces}:
+        if len(face.edges) != 4:
+            continue
+        flags = [edge in cut for edge in face.edges]
+        # A fully cut quad gets a grid centre, two adjacent cut edges get an inner corner vertex
+        if sum(flags) == 4 or (sum(flags) == 2 and flags[0] != flags[2]):
+            inner += 1
+    return len(cut) + inner
+
+
+def subdivide_region(mesh, selection, rounds, smoothness=0.0, max_edge_length=0.0, vertex_budget=0, operator=None):
+    """Subdivides the faces of a vertex selection with bmesh from Object Mode, splitting only edges longer
+    than max_edge_length (0 splits all) and adding at most vertex_budget vertices (0 for no limit).
+    Returns the number of vertices added."""
+    bm = bmesh.new()
+    bm.from_mesh(mesh.data)
+    bm.verts.ensure_lookup_table()
+    region = {bm.verts[v_idx] for v_idx in np.flatnonzero(selection).tolist()}
+    # Edge lengths are measured in world space like the operator radii
+    linear = mesh.matrix_world.to_3x3()
+    before = len(bm.verts)
+    predicted = 0
+    rounds_done = 0
+    budget_reached = False
+
+    for _ in range(rounds):
+        edges = list({edge for vert in region for edge in vert.link_edges if edge.other_vert(vert) in region})
+        lengths = [(linear @ (edge.verts[1].co - edge.verts[0].co)).length for edge in edges]
+        candidates = [edge for edge, length in sorted(zip(edges, lengths), key=lambda pair: -pair[1]) if length > max_edge_length]
+        if not candidates:
+            break
+        cut = candidates
+        growth = predict_subdivision(cut)
+        if vertex_budget > 0:
+            # Keep the longest edges until the predicted growth fits in what is left of the budget
+            remaining = vertex_budget - predicted
+            while cut and growth > remaining:
+                cut = cut[:max(0, len(cut) - (growth - remaining))]
+                growth = predict_subdivision(cut)
+            budget_reached = len(cut) < len(candidates)
+            if not cut:
+                break
+        result = bmesh.ops.subdivide_edges(bm, edges=cut, cuts=1, smooth=smoothness, smooth_falloff='LINEAR', use_grid_fill=True, quad_corner_type='INNER_VERT')
+        # New vertices belong to the region so the next round splits them again, like an Edit Mode selection
+        region.update(ele for ele in result['geom'] if isinstance(ele, bmesh.types.BMVert))
+        predicted += growth
+        rounds_done += 1
+        if budget_reached:
+            break
+
+    added = len(bm.verts) - before
+    if operator:
+        operator.report({'INFO'}, f"Subdivision adds {added} vertices ({before} -> {before + added}, predicted {predicted}) in {rounds_done} round(s)")
+        if budget_reached:
+            operator.report({'WARNING'}, f"Vertex budget of {vertex_budget} reached, only the longest edges were split")
+    # The subdivided region stays selected, as it would after the Edit Mode operator
+    for vert in bm.verts:
+        vert.select = vert in region
+    bm.select_flush(True)
+    bm.to_mesh(mesh.data)
+    bm.free()
+    mesh.data.update()
+    return added
+
+
+def jiggle_region_weights(positions, world_to_armature, bone_center, affect_radius):
+    """Back, left and right jiggle weights for a set of world-space positions in one batched pass,
+    returned as {side: (mask, weights)}"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    matrix = np.array(world_to_armature, dtype=np.float64)
+    local = positions @ matrix[:3, :3].T + matrix[:3, 3]
+    center_dist = np.linalg.norm(positions - np.asarray(bone_center, dtype=np.float64), axis=1)
+
+    # Back: negative Y in armature space, assuming Y is back
+    back = (local[:, 1] < 0) & (center_dist < affect_radius * 1.0)
+    back_weights = np.clip(np.exp(-np.abs(local[:, 1]) / (affect_radius * 0.5)) * 0.8, 0.0, 1.0)
+
+    # Sides: a thin slab around Y = 0, falling off along X
+    side = (np.abs(local[:, 1]) < 0.1) & (center_dist < affect_radius * 0.8)
+    side_weights = np.clip(np.exp(-np.abs(local[:, 0]) / (affect_radius * 0.4)) * 0.7, 0.0, 1.0)
+
+    regions = {}
+    for name, mask, weights in (('Back', back, back_weights), ('Left', side & (local[:, 0] > 0), side_weights), ('Right', side & (local[:, 0] < 0), side_weights)):
+        mask = mask & (weights > 0.0)
+        regions[name] = (mask, weights[mask])
+    return regions
+
+
+def fused_breast_weights(source_weights, dist, weight_increase, end_shrink_factor, end_weight_reduction, bone_count):
+    """Computes the Bust2, _end and _3 weights from one distance evaluation, as (mask, weights) pairs"""
+    # Increase non-blue weights (< 0.2) more at the center, less at the edges
+    increased = np.clip(source_weights * (weight_increase - 0.5 * dist), 0.0, 1.0)
+    increased_mask = (source_weights < 0.2) & (increased > 0.0)
+    # _end and _3 start from the source weights after the increase, like the reference scans
+    updated = np.where(increased_mask, increased, source_weights)
+    end_weights = np.clip(updated * end_shrink_factor * end_weight_reduction, 0.0, 1.0)
+    results = [(increased_mask, increased), ((dist < 0.3) & (end_weights > 0.0), end_weights)]
+    if bone_count == 4:
+        third_weights = np.clip(updated * end_shrink_factor * 0.5 * end_weight_reduction, 0.0, 1.0)
+        results.append(((dist < 0.2) & (third_weights > 0.0), third_weights))
+    return results
+
+
+class PlannedVertexGroup:
+    """Stand-in for a vertex group a ChangeSet creates on commit, holding the index it will get"""
+
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+
+def set_attribute_path(obj, path, value):
+    """setattr through a dotted path such as 'shape.sphere.radius'"""
+    *parents, attribute = path.split(".")
+    for parent in parents:
+        obj = getattr(obj, parent)
+    setattr(obj, attribute, value)
+
+
+def collider_shape_attributes(shape_type, **values):
+    """{'shape.capsule.radius': ...} style paths for the shape of a collider"""
+    shape = "capsule" if shape_type == "Capsule" else "sphere"
+    return {f"shape.{shape}.{name}": value for name, value in values.items() if value is not None}
+
+
+def format_names(names, limit=6):
+    names = list(names)
+    return ", ".join(names[:limit]) + (f" and {len(names) - limit} more" if len(names) > limit else "")
+
+
+class ChangeSet:
+    """Bones, vertex groups, spring bone edits, shape keys and vertex weights planned by operators and applied
+    in one commit. Planning reads the model but never changes it, so a failed or dry run leaves it untouched.
+    Subdivision and scaling cannot be planned, operators commit the plan before them."""
+
+    def __init__(self, run):
+        self.run = run
+        self.dry_run = bpy.context.scene.vrm_dry_run
+        self.vertex_groups = []
+        self.colliders = []
+        self.collider_edits = []
+        self.collider_groups = []
+        self.springs = []
+        self.joints = []
+        self.joint_edits = []
+        self.joint_profiles = []
+        self.spring_collider_groups = []
+        self.shape_keys = []
+
+    def queue_bone(self, armature, name, parent, **placement):
+        """Queues a bone on the shared ModeSession, see ModeSession.queue_bone"""
+        return self.run.session.queue_bone(armature, name, parent, **placement)
+
+    def vertex_group(self, name, create=True):
+        """Existing vertex group, else the planned one, else (with create) a new PlannedVertexGroup"""
+        mesh = self.run.mesh
+        vertex_group = mesh.vertex_groups.get(name)
+        if vertex_group is not None:
+            return vertex_group
+        planned = next((planned for planned in self.vertex_groups if planned.name == name), None)
+        if planned is None and create:
+            # vertex_groups.new appends, so the group gets the next free index on commit
+            planned = PlannedVertexGroup(name, len(mesh.vertex_groups) + len(self.vertex_groups))
+            self.vertex_groups.append(planned)
+        return planned
+
+    def add_collider(self, bone_name, shape_type=None, values_shape_type=None, **shape):
+        """Plans a collider on a bone with its shape radius, offset and tail, written to values_shape_type's settings if given"""
+        self.colliders.append((bone_name, shape_type, collider_shape_attributes(values_shape_type or shape_type, **shape)))
+
+    def edit_collider(self, collider_pos, shape_type=None, **shape):
+        self.collider_edits.append((collider_pos, collider_shape_attributes(shape_type, **shape)))
+
+    def add_collider_group(self, name, collider_names=()):
+        self.collider_groups.append((name, list(collider_names)))
+
+    def add_spring_collider_group(self, spring_pos, group_name):
+        self.spring_collider_groups.append((spring_pos, group_name))
+
+    def add_spring(self, name):
+        """Plans a spring and returns the position it will have"""
+        self.springs.append(name)
+        return len(self.run.spring_index.spring_bone.springs) + len(self.springs) - 1
+
+    def add_joint(self, spring_pos, bone_name, **attributes):
+        """Plans a joint at the end of an existing or planned spring with its parameters"""
+        self.joints.append((spring_pos, bone_name, attributes))
+
+    def edit_joints(self, spring_pos, bone_name, **attributes):
+        """Plans new parameters for the existing joints of a spring on the given bone"""
+        self.joint_edits.append((spring_pos, bone_name, attributes))
+
+    def apply_joint_profile(self, spring_positions, profile):
+        """Plans apply_joint_profile for springs that may only exist after the commit"""
+        self.joint_profiles.append((list(spring_positions), profile))
+
+    def add_shape_key(self, skinning, name, offsets, value=0.0):
+        self.shape_keys.append((skinning, name, offsets, value))
+
+    def summary(self):
+        """Diff of the plan, one line per kind of change"""
+        lines = []
+        bones = self.run.session.queued_bones()
+        if bones:
+            lines.append(f"+{len(bones)} bone(s): {format_names(bones)}")
+        if self.vertex_groups:
+            lines.append(f"+{len(self.vertex_groups)} vertex group(s): {format_names(group.name for group in self.vertex_groups)}")
+        if self.colliders or self.collider_edits:
+            lines.append(f"+{len(self.colliders)} collider(s) on {format_names(dict.fromkeys(bone for bone, _, _ in self.colliders))}, {len(self.collider_edits)} collider(s) changed")
+        if self.collider_groups:
+            lines.append(f"+{len(self.collider_groups)} collider group(s): {format_names(name for name, _ in self.collider_groups)}")
+        if self.springs or self.joints:
+            lines.append(f"+{len(self.springs)} spring(s), +{len(self.joints)} joint(s)")
+        if self.spring_collider_groups:
+            lines.append(f"+{len(self.spring_collider_groups)} spring collider group reference(s)")
+        if self.joint_edits or self.joint_profiles:
+            lines.append(f"{len(self.joint_edits)} joint edit(s), {sum(len(positions) for positions, _ in self.joint_profiles)} spring(s) reprofiled")
+        if self.shape_keys:
+            lines.append(f"+{len(self.shape_keys)} shape key(s): {format_names(name for _, name, _, _ in self.shape_keys)}")
+        if self.run._mesh_cache is not None:
+            groups = self.run._mesh_cache.writer.pending_groups()
+            if groups:
+                added = sum(counts[0] for counts in groups.values())
+                removed = sum(counts[1] for counts in groups.values())
+                lines.append(f"{added} weight(s) set, {removed} removed in {len(groups)} group(s): {format_names(groups)}")
+        return lines or ["No changes"]
+
+    def commit(self):
+        """Applies everything planned, RNA structure first and vertex weights last, and empties the plan"""
+        run = self.run
+        created_bones = run.session.flush_bones()
+        for planned in self.vertex_groups:
+            run.mesh.vertex_groups.new(name=planned.name)
+
+        if any((self.colliders, self.collider_edits, self.collider_groups, self.springs, self.joints, self.joint_edits, self.joint_profiles, self.spring_collider_groups)):
+            spring_index = run.spring_index
+            colliders = spring_index.spring_bone.colliders
+            for bone_name, shape_type, attributes in self.colliders:
+                collider = spring_index.add_collider(bone_name, shape_type)
+                for path, value in attributes.items():
+                    set_attribute_path(collider, path, value)
+            for collider_pos, attributes in self.collider_edits:
+                for path, value in attributes.items():
+                    set_attribute_path(colliders[collider_pos], path, value)
+            for name, collider_names in self.collider_groups:
+                spring_index.add_collider_group(name, collider_names)
+            for name in self.springs:
+                spring_index.add_spring(name)
+            for spring_pos, bone_name, attributes in self.joints:
+                joint = spring_index.add_joint(spring_pos, bone_name)
+                for attribute, value in attributes.items():
+                    setattr(joint, attribute, value)
+            for spring_pos, group_name in self.spring_collider_groups:
+                spring_index.add_spring_collider_group(spring_pos, group_name)
+            for spring_pos, bone_name, attributes in self.joint_edits:
+                for joint in spring_index.spring_joints(spring_pos, bone_name):
+                    for attribute, value in attributes.items():
+                        setattr(joint, attribute, value)
+            springs = spring_index.spring_bone.springs
+            for spring_positions, profile in self.joint_profiles:
+                apply_joint_profile([(spring_pos, springs[spring_pos]) for spring_pos in spring_positions], profile)
+
+        for skinning, name, offsets, value in self.shape_keys:
+            skinning.write_shape_key(name, offsets, value)
+
+        if run._mesh_cache is not None:
+            writer = run._mesh_cache.writer
+            writer.resolve_groups(run.mesh.vertex_groups)
+            writer.commit()
+        self._clear()
+        return created_bones
+
+    def discard(self):
+        """Drops the plan, nothing it held reaches the model"""
+        self.run.session.discard_bones()
+        if self.run._mesh_cache is not None:
+            self.run._mesh_cache.writer.discard()
+        self._clear()
+
+    def _clear(self):
+        for planned in (self.vertex_groups, self.colliders, self.collider_edits, self.collider_groups, self.springs,
+                        self.joints, self.joint_edits, self.joint_profiles, self.spring_collider_groups, self.shape_keys):
+            planned.clear()
+
+
+class RunContext:
+    """Armature, mesh and the indexes and caches built from them, shared by every step of a recipe.
+    An operator run on its own gets a fresh one."""
+
+    # Set by run_recipe while its steps execute
+    active = None
+
+    def __init__(self, operator=None):
+        self.operator = operator
+        self.session = ModeSession(operator)
+        self._armature = None
+        self._mesh = None
+        self._mesh_cache = None
+        self._armature_index = None
+        self._spring_index = None
+        self._changes = None
+
+    @classmethod
+    def acquire(cls, operator):
+        """The running recipe's context, now reporting to the given operator, or a new one"""
+        run = cls.active
+        if run is None:
+            return cls(operator)
+        run.operator = operator
+        run.session.operator = operator
+        return run
+
+    @property
+    def armature(self):
+        if self._armature is None:
+            self._armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
+        return self._armature
+
+    @property
+    def mesh(self):
+        if self._mesh is None:
+            self._mesh = next(obj for obj in self.armature.children if obj.type == 'MESH')
+        return self._mesh
+
+    @property
+    def mesh_cache(self):
+        if self._mesh_cache is None:
+            self._mesh_cache = MeshCache(self.mesh)
+        return self._mesh_cache
+
+    @property
+    def armature_index(self):
+        """ArmatureIndex, rebuilt when bones were added since the last build"""
+        if self._armature_index is None or len(self._armature_index.names) != len(self.armature.data.bones):
+            self._armature_index = ArmatureIndex(self.armature)
+        return self._armature_index
+
+    @property
+    def spring_index(self):
+        """SpringBoneIndex, kept current by adding springs, joints and colliders through it"""
+        if self._spring_index is None:
+            self._spring_index = SpringBoneIndex.from_armature(self.armature)
+        return self._spring_index
+
+    @property
+    def changes(self):
+        """ChangeSet the operators plan into"""
+        if self._changes is None:
+            self._changes = ChangeSet(self)
+        return self._changes
+
+    def complete(self, operator):
+        """Ends an operator: recipe steps leave the plan to the recipe, a dry run reports and drops it, otherwise it is committed"""
+        if RunContext.active is self:
+            return {'FINISHED'}
+        changes = self.changes
+        for line in changes.summary():
+            operator.report({'INFO'}, f"{'Dry run' if changes.dry_run else 'Changes'}: {line}")
+        if changes.dry_run:
+            changes.discard()
+        else:
+            changes.commit()
+            if self._mesh_cache is not None:
+                operator.report({'INFO'}, self._mesh_cache.writer.summary())
+        operator.report({'INFO'}, self.session.summary())
+        return {'FINISHED'}
+
+    def invalidate(self):
+        """Drops the world-space data, call after the model is moved or scaled"""
+        if self._mesh_cache is not None:
+            self._mesh_cache.invalidate()
+        self._armature_index = None
+
+
+def load_recipe(path):
+    """Reads a JSON or TOML recipe: optional top-level settings and a list of steps, each an operator id with its own settings"""
+    path = bpy.path.abspath(path)
+    if path.lower().endswith(".toml"):
+        import tomllib
+        with open(path, 'rb') as f:
+            recipe = tomllib.load(f)
+    else:
+        with open(path, 'r') as f:
+            recipe = json.load(f)
+    validate_recipe(recipe, bpy.context.scene)
+    return recipe
+
+
+def validate_recipe(recipe, scene):
+    """Checks every operator and setting name before anything runs, so a typo cannot leave the model half processed"""
+    steps = recipe.get("steps")
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("Recipe has no steps")
+    operators = set(dir(bpy.ops.vrm))
+    for step_idx, step in enumerate(steps, 1):
+        idname = step.get("operator", "")
+        module_name, _, op_name = idname.partition(".")
+        if module_name != "vrm" or op_name not in operators or idname == "vrm.run_recipe":
+            raise ValueError(f"Step {step_idx}: unknown operator {idname!r}")
+        for name in list(recipe.get("settings", {})) + list(step.get("settings", {})):
+            if not name.startswith("vrm_") or not hasattr(scene, name):
+                raise ValueError(f"Step {step_idx}: unknown setting {name!r}")
+
+
+def apply_scene_settings(scene, settings, previous=None):
+    """Sets panel properties by name, lists become vectors. The values they replace are saved into previous first"""
+    for name, value in settings.items():
+        if previous is not None:
+            current = getattr(scene, name)
+            previous.setdefault(name, current if isinstance(current, (bool, int, float, str)) else tuple(current))
+        setattr(scene, name, tuple(value) if isinstance(value, list) else value)
+
+
+def run_recipe(recipe, operator):
+    """Plans the steps in order into one shared RunContext, then commits the merged plan (or reports it for a dry run).
+    Returns (operator, seconds) per step and raises at the first step that does not finish, dropping the plan.
+    Recipe and step settings only last for the recipe and the step, the panel values are restored afterwards."""
+    scene = bpy.context.scene
+    run = RunContext(operator)
+    RunContext.active = run
+    timings = []
+    recipe_previous = {}
+    try:
+        try:
+            apply_scene_settings(scene, recipe.get("settings", {}), recipe_previous)
+            for step in recipe["steps"]:
+                step_previous = {}
+                try:
+                    apply_scene_settings(scene, step.get("settings", {}), step_previous)
+                    idname = step["operator"]
+                    start_time = time.perf_counter()
+                    # Steps are called as nested operators, so only the recipe operator pushes an undo step
+                    result = getattr(bpy.ops.vrm, idname.partition(".")[2])()
+                    timings.append((idname, time.perf_counter() - start_time))
+                finally:
+                    apply_scene_settings(scene, step_previous)
+                if 'FINISHED' not in result:
+                    raise RuntimeError(f"{idname} did not finish")
+        except Exception:
+            run.changes.discard()
+            raise
+        finally:
+            RunContext.active = None
+        # Committed while the recipe settings still apply, Dry Run among them
+        run.complete(operator)
+    finally:
+        apply_scene_settings(scene, recipe_previous)
+    return timings
+
+
 class VRM_OT_Set_Jiggle_Physics_Preset(bpy.types.Operator):
     """Sets jiggle physics parameters based on selected preset for ripple effect"""
     bl_idname = "vrm.set_jiggle_physics_preset"
@@ -515,19 +2200,16 @@ class VRM_OT_Scale_Model_Physics(bpy.types.Operator):
 
             # Get the scale factor from scene properties
             scale_factor = context.scene.vrm_scale_factor
-            scale_factor_1_4 = scale_factor ** 1.4  # For stiffness and drag_force (others)
-            scale_factor_0_9 = scale_factor ** 0.9  # For stiffness (non-end bust)
-            scale_factor_0_8 = scale_factor ** 0.8  # For stiffness (end bust)
-            scale_factor_0_7 = scale_factor ** 0.7  # For stiffness (third bust)
-            scale_factor_0_2 = scale_factor ** 0.2  # For drag_force (end bust)
-            scale_factor_0_1 = scale_factor ** 0.1  # For drag_force (third bust)
-            scale_factor_0_001 = scale_factor ** 0.001  # For drag_force (non-end bust)
-
-            # Define bust joint names
-            bust_joints = [
-                "J_Sec_L_Bust1", "J_Sec_L_Bust2", "J_Sec_R_Bust1", "J_Sec_R_Bust2",
-                "J_Sec_L_Bust2_end", "J_Sec_R_Bust2_end", "J_Sec_L_Bust3", "J_Sec_R_Bust3"
-            ]
+
+            # Scaling is applied directly, so a dry run only describes it and anything planned before is committed first
+            run = RunContext.acquire(self)
+            changes = run.changes
+            if changes.dry_run:
+                spring_bone = armature.data.vrm_addon_extension.spring_bone1
+                joint_count = sum(len(spring.joints) for spring in spring_bone.springs)
+                self.report({'INFO'}, f"Dry run: would scale the model by {scale_factor} with {joint_count} joint(s) and {len(spring_bone.colliders)} collider(s)")
+                return run.complete(self)
+            changes.commit()
 
             # Scale the armature
             armature.scale = (scale_factor, scale_factor, scale_factor)
@@ -535,60 +2217,17 @@ class VRM_OT_Scale_Model_Physics(bpy.types.Operator):
             # Get VRM extension
             vrm_extension = armature.data.vrm_addon_extension
 
-            # Adjust SpringBone settings for VRM 1.0
+            # Adjust SpringBone settings for VRM 1.0, every joint and collider is visited once
             if hasattr(vrm_extension, 'spring_bone1') and hasattr(vrm_extension.spring_bone1, 'springs'):
-                for spring in vrm_extension.spring_bone1.springs:
-                    # Adjust joint properties
-                    if hasattr(spring, 'joints'):
-                        for joint in spring.joints:
-                            # Get joint name (if available)
-                            joint_name = getattr(joint.node, 'bone_name', None) if hasattr(joint, 'node') else None
-                            
-                            # Scale stiffness
-                            if hasattr(joint, 'stiffness'):
-                                if joint_name in ["J_Sec_L_Bust1", "J_Sec_L_Bust2", "J_Sec_R_Bust1", "J_Sec_R_Bust2"]:
-                                    joint.stiffness *= scale_factor_0_9  # S^0.9 for non-end bust
-                                elif joint_name in ["J_Sec_L_Bust2_end", "J_Sec_R_Bust2_end"]:
-                                    joint.stiffness *= scale_factor_0_8  # S^0.8 for end bust
-                                elif joint_name in ["J_Sec_L_Bust3", "J_Sec_R_Bust3"]:
-                                    joint.stiffness *= scale_factor_0_7  # S^0.7 for third bust
-                                else:
-                                    joint.stiffness *= scale_factor_1_4  # S^1.4 for others
-
-                            # Scale drag_force
-                            if hasattr(joint, 'drag_force'):
-                                if joint_name in ["J_Sec_L_Bust1", "J_Sec_L_Bust2", "J_Sec_R_Bust1", "J_Sec_R_Bust2"]:
-                                    joint.drag_force *= scale_factor_0_001  # S^0.001 for non-end bust
-                                elif joint_name in ["J_Sec_L_Bust2_end", "J_Sec_R_Bust2_end"]:
-                                    joint.drag_force *= scale_factor_0_2  # S^0.2 for end bust
-                                elif joint_name in ["J_Sec_L_Bust3", "J_Sec_R_Bust3"]:
-                                    joint.drag_force *= scale_factor_0_1  # S^0.1 for third bust
-                                else:
-                                    joint.drag_force *= scale_factor_1_4  # S^1.4 for others
-
-                            # Keep gravity_power unchanged
-                            if hasattr(joint, 'gravity_power'):
-                                pass  # No scaling
-
-                            # Scale hit_radius linearly
-                            if hasattr(joint, 'radius'):
-                                joint.radius *= scale_factor
-
-                    # Scale collider radii linearly
-                    if hasattr(spring, 'collider_groups'):
-                        for collider_group in spring.collider_groups:
-                            if hasattr(collider_group, 'colliders'):
-                                for collider_ref in collider_group.colliders:
-                                    # Find the actual collider in vrm_extension.spring_bone1.colliders
-                                    collider = next((c for c in vrm_extension.spring_bone1.colliders if c.node.bone_name == collider_ref.collider_name), None)
-                                    if collider:
-                                        if hasattr(collider.shape, 'sphere') and hasattr(collider.shape.sphere, 'radius'):
-                                            collider.shape.sphere.radius *= scale_factor
-                                        elif hasattr(collider.shape, 'capsule') and hasattr(collider.shape.capsule, 'radius'):
-                                            collider.shape.capsule.radius *= scale_factor
+                start_time = time.perf_counter()
+                joint_count, collider_count = scale_spring_bone_physics(SpringBoneIndex(vrm_extension.spring_bone1), scale_factor)
+                elapsed = (time.perf_counter() - start_time) * 1000.0
+                self.report({'INFO'}, f"Scaled {joint_count} joint(s) and {collider_count} collider(s) in {elapsed:.1f} ms")
 
             # Apply the scale to make it permanent
             bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+            # World-space positions and bone geometry cached by earlier recipe steps no longer apply
+            run.invalidate()
 
             self.report({'INFO'}, "Model scaled and physics settings adjusted successfully")
             return {'FINISHED'}
@@ -627,32 +2266,22 @@ class VRM_OT_Add_Breast_Physics_Colliders(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
+            run = RunContext.acquire(self)
+            armature = run.armature
             bpy.context.view_layer.objects.active = armature
-            sb = armature.data.vrm_addon_extension.spring_bone1
-
-            left_collider = sb.colliders.add()
-            left_collider.node.bone_name = "J_Sec_L_Bust1"
-            left_collider.shape.sphere.radius = 0.07
-            left_collider.shape.sphere.offset = [-0.13, -0.052, 0.018]
+            spring_index = run.spring_index
+            changes = run.changes
 
-            right_collider = sb.colliders.add()
-            right_collider.node.bone_name = "J_Sec_R_Bust1"
-            right_collider.shape.sphere.radius = 0.07
-            right_collider.shape.sphere.offset = [0.13, -0.052, 0.018]
+            changes.add_collider("J_Sec_L_Bust1", radius=0.07, offset=[-0.13, -0.052, 0.018])
+            changes.add_collider("J_Sec_R_Bust1", radius=0.07, offset=[0.13, -0.052, 0.018])
 
-            new_group = sb.collider_groups.add()
-            new_group.vrm_name = "Breasts"
+            changes.add_collider_group("Breasts", ["J_Sec_L_Bust1", "J_Sec_R_Bust1"])
 
-            new_group.colliders.add().collider_name = "J_Sec_L_Bust1"
-            new_group.colliders.add().collider_name = "J_Sec_R_Bust1"
-
-            for spring in sb.springs:
-                if "Hair" in spring.vrm_name:
-                    spring.collider_groups.add().collider_group_name = "Breasts"
+            for spring_pos, spring in spring_index.springs('HAIR'):
+                changes.add_spring_collider_group(spring_pos, "Breasts")
 
             self.report({'INFO'}, "Breast physics colliders added successfully")
-            return {'FINISHED'}
+            return run.complete(self)
         except Exception as e:
             self.report({'ERROR'}, f"Error: {str(e)}")
             return {'CANCELLED'}
@@ -666,11 +2295,11 @@ class VRM_OT_Breast_Physics_Tweaker(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
-            mesh = next(obj for obj in armature.children if obj.type == 'MESH')
-            bpy.context.view_layer.objects.active = armature
-            bpy.ops.object.mode_set(mode='EDIT')
-            edit_bones = armature.data.edit_bones
+            run = RunContext.acquire(self)
+            armature = run.armature
+            mesh = run.mesh
+            session = run.session
+            changes = run.changes
 
             # Define bones to process
             bust_bones = ["J_Sec_L_Bust2", "J_Sec_R_Bust2"]
@@ -678,42 +2307,20 @@ class VRM_OT_Breast_Physics_Tweaker(bpy.types.Operator):
             third_bone_names = ["J_Sec_L_Bust3", "J_Sec_R_Bust3"]
             bone_count = int(context.scene.vrm_breast_bone_count)
 
-            # Add new end bones if they don't exist
+            # Queue new end bones if they don't exist, continuing the source bone
             for bust_bone, end_bone_name in zip(bust_bones, end_bone_names):
-                if end_bone_name not in edit_bones:
-                    source_bone = edit_bones.get(bust_bone)
-                    if not source_bone:
+                if end_bone_name not in armature.data.bones:
+                    if bust_bone not in armature.data.bones:
                         self.report({'WARNING'}, f"Bone {bust_bone} not found")
                         continue
-                    new_bone = edit_bones.new(end_bone_name)
-                    bone_length = source_bone.length
-                    direction = (source_bone.tail - source_bone.head).normalized()
-                    new_bone.head = source_bone.tail
-                    new_bone.tail = new_bone.head + bone_length * direction
-                    new_bone.parent = source_bone
-                    new_bone.use_deform = True
-                    self.report({'INFO'}, f"Created bone {end_bone_name}")
-
-            # Add new third bones if bone_count is 4
+                    changes.queue_bone(armature, end_bone_name, bust_bone)
+
+            # Queue new third bones if bone_count is 4, the end bone may itself still be queued
             if bone_count == 4:
                 for end_bone_name, third_bone_name in zip(end_bone_names, third_bone_names):
-                    end_bone = edit_bones.get(end_bone_name)
-                    if not end_bone:
-                        self.report({'WARNING'}, f"Bone {end_bone_name} not found")
-                        continue
-                    if third_bone_name not in edit_bones:
-                        new_bone = edit_bones.new(third_bone_name)
-                        bone_length = end_bone.length
-                        direction = (end_bone.tail - end_bone.head).normalized()
-                        new_bone.head = end_bone.tail
-                        new_bone.tail = new_bone.head + bone_length * direction
-                        new_bone.parent = end_bone
-                        new_bone.use_deform = True
-                        self.report({'INFO'}, f"Created bone {third_bone_name}")
+                    changes.queue_bone(armature, third_bone_name, end_bone_name)
 
-            bpy.ops.object.mode_set(mode='OBJECT')
-            bpy.context.view_layer.objects.active = mesh
-            mesh_data = mesh.data
+            session.set(mesh, 'OBJECT')
 
             # Get user-defined parameters
             weight_increase = context.scene.vrm_breast_weight_increase
@@ -721,93 +2328,66 @@ class VRM_OT_Breast_Physics_Tweaker(bpy.types.Operator):
             end_weight_reduction = context.scene.vrm_breast_end_weight_reduction
             gravity_power = context.scene.vrm_breast_gravity_power
 
-            # Create or get vertex groups for _end and _3 bones
-            for end_bone in end_bone_names:
-                if end_bone not in mesh.vertex_groups:
-                    mesh.vertex_groups.new(name=end_bone)
-                    self.report({'INFO'}, f"Created vertex group {end_bone}")
-            if bone_count == 4:
-                for third_bone in third_bone_names:
-                    if third_bone not in mesh.vertex_groups:
-                        mesh.vertex_groups.new(name=third_bone)
-                        self.report({'INFO'}, f"Created vertex group {third_bone}")
+            # Plan vertex groups for _end and _3 bones, existing ones are reused
+            for vertex_group_name in end_bone_names + (third_bone_names if bone_count == 4 else []):
+                if isinstance(changes.vertex_group(vertex_group_name), PlannedVertexGroup):
+                    self.report({'INFO'}, f"Planned vertex group {vertex_group_name}")
 
             # Add or update spring bone settings for VRM
-            sb = armature.data.vrm_addon_extension.spring_bone1
-            for spring in sb.springs:
-                if any(b in spring.vrm_name for b in ["Bust", "Breast"]):
-                    # Determine the side of the spring (left or right)
-                    is_left = "L" in spring.vrm_name or any("J_Sec_L_Bust" in joint.node.bone_name for joint in spring.joints)
-                    is_right = "R" in spring.vrm_name or any("J_Sec_R_Bust" in joint.node.bone_name for joint in spring.joints)
-                    
-                    # Skip if spring side is ambiguous
-                    if not (is_left or is_right) or (is_left and is_right):
-                        self.report({'WARNING'}, f"Spring {spring.vrm_name} has ambiguous side, skipping joint assignment")
-                        continue
+            spring_index = run.spring_index
+            for spring_pos, spring in spring_index.springs('BUST'):
+                # Determine the side of the spring (left or right)
+                spring_bones = spring_index.spring_bones(spring_pos)
+                is_left = "L" in spring.vrm_name or any("J_Sec_L_Bust" in bone for bone in spring_bones)
+                is_right = "R" in spring.vrm_name or any("J_Sec_R_Bust" in bone for bone in spring_bones)
+
+                # Skip if spring side is ambiguous
+                if not (is_left or is_right) or (is_left and is_right):
+                    self.report({'WARNING'}, f"Spring {spring.vrm_name} has ambiguous side, skipping joint assignment")
+                    continue
 
-                    # Select bones for this spring based on side
-                    side_bust_bone = "J_Sec_L_Bust2" if is_left else "J_Sec_R_Bust2"
-                    side_end_bone = "J_Sec_L_Bust2_end" if is_left else "J_Sec_R_Bust2_end"
-                    side_third_bone = "J_Sec_L_Bust3" if is_left else "J_Sec_R_Bust3"
-
-                    # Check if joints for bust, end, and third bones exist
-                    bust_joint_exists = any(joint.node.bone_name == side_bust_bone for joint in spring.joints)
-                    end_joint_exists = any(joint.node.bone_name == side_end_bone for joint in spring.joints)
-                    third_joint_exists = any(joint.node.bone_name == side_third_bone for joint in spring.joints)
-
-                    # Update or add bust joint
-                    if not bust_joint_exists:
-                        joint = spring.joints.add()
-                        joint.node.bone_name = side_bust_bone
-                        joint.stiffness = 0.9
-                        joint.drag_force = 0.25
-                        joint.radius = 0.06
-                        joint.gravity_power = gravity_power * (0.75 if bone_count == 3 else 0.5)
-                        joint.gravity_dir = Vector((0.0, 0.0, -1.0))
-                        self.report({'INFO'}, f"Added spring joint for {side_bust_bone} in {spring.vrm_name}")
-                    else:
-                        for joint in spring.joints:
-                            if joint.node.bone_name == side_bust_bone:
-                                joint.gravity_power = gravity_power * (0.75 if bone_count == 3 else 0.5)
-                                self.report({'INFO'}, f"Updated gravity_power for {side_bust_bone} in {spring.vrm_name} to {joint.gravity_power}")
-
-                    # Update or add end joint
-                    if not end_joint_exists:
-                        joint = spring.joints.add()
-                        joint.node.bone_name = side_end_bone
-                        joint.stiffness = 0.8
-                        joint.drag_force = 0.2
-                        joint.radius = 0.05
-                        joint.gravity_power = gravity_power * (1.0 if bone_count == 3 else 0.75)
-                        joint.gravity_dir = Vector((0.0, 0.0, -1.0))
-                        self.report({'INFO'}, f"Added spring joint for {side_end_bone} in {spring.vrm_name}")
+                # Select bones for this spring based on side
+                side_bust_bone = "J_Sec_L_Bust2" if is_left else "J_Sec_R_Bust2"
+                side_end_bone = "J_Sec_L_Bust2_end" if is_left else "J_Sec_R_Bust2_end"
+                side_third_bone = "J_Sec_L_Bust3" if is_left else "J_Sec_R_Bust3"
+
+                # Update or add bust joint
+                if not spring_index.spring_joints(spring_pos, side_bust_bone):
+                    changes.add_joint(spring_pos, side_bust_bone, stiffness=0.9, drag_force=0.25, radius=0.06, gravity_power=gravity_power * (0.75 if bone_count == 3 else 0.5), gravity_dir=(0.0, 0.0, -1.0))
+                    self.report({'INFO'}, f"Added spring joint for {side_bust_bone} in {spring.vrm_name}")
+                else:
+                    changes.edit_joints(spring_pos, side_bust_bone, gravity_power=gravity_power * (0.75 if bone_count == 3 else 0.5))
+                    self.report({'INFO'}, f"Updated gravity_power for {side_bust_bone} in {spring.vrm_name} to {gravity_power * (0.75 if bone_count == 3 else 0.5)}")
+
+                # Update or add end joint
+                if not spring_index.spring_joints(spring_pos, side_end_bone):
+                    changes.add_joint(spring_pos, side_end_bone, stiffness=0.8, drag_force=0.2, radius=0.05, gravity_power=gravity_power * (1.0 if bone_count == 3 else 0.75), gravity_dir=(0.0, 0.0, -1.0))
+                    self.report({'INFO'}, f"Added spring joint for {side_end_bone} in {spring.vrm_name}")
+                else:
+                    changes.edit_joints(spring_pos, side_end_bone, gravity_power=gravity_power * (1.0 if bone_count == 3 else 0.75))
+                    self.report({'INFO'}, f"Updated gravity_power for {side_end_bone} in {spring.vrm_name} to {gravity_power * (1.0 if bone_count == 3 else 0.75)}")
+
+                # Update or add third joint if bone_count is 4
+                if bone_count == 4:
+                    if not spring_index.spring_joints(spring_pos, side_third_bone):
+                        changes.add_joint(spring_pos, side_third_bone, stiffness=0.7, drag_force=0.15, radius=0.04, gravity_power=gravity_power, gravity_dir=(0.0, 0.0, -1.0))
+                        self.report({'INFO'}, f"Added spring joint for {side_third_bone} in {spring.vrm_name}")
                     else:
-                        for joint in spring.joints:
-                            if joint.node.bone_name == side_end_bone:
-                                joint.gravity_power = gravity_power * (1.0 if bone_count == 3 else 0.75)
-                                self.report({'INFO'}, f"Updated gravity_power for {side_end_bone} in {spring.vrm_name} to {joint.gravity_power}")
+                        changes.edit_joints(spring_pos, side_third_bone, gravity_power=gravity_power)
+                        self.report({'INFO'}, f"Updated gravity_power for {side_third_bone} in {spring.vrm_name} to {gravity_power}")
 
-                    # Update or add third joint if bone_count is 4
-                    if bone_count == 4:
-                        if not third_joint_exists:
-                            joint = spring.joints.add()
-                            joint.node.bone_name = side_third_bone
-                            joint.stiffness = 0.7
-                            joint.drag_force = 0.15
-                            joint.radius = 0.04
-                            joint.gravity_power = gravity_power
-                            joint.gravity_dir = Vector((0.0, 0.0, -1.0))
-                            self.report({'INFO'}, f"Added spring joint for {side_third_bone} in {spring.vrm_name}")
-                        else:
-                            for joint in spring.joints:
-                                if joint.node.bone_name == side_third_bone:
-                                    joint.gravity_power = gravity_power
-                                    self.report({'INFO'}, f"Updated gravity_power for {side_third_bone} in {spring.vrm_name} to {joint.gravity_power}")
+            # Read all vertex group memberships and world positions once for both sides
+            cache = run.mesh_cache
+            weight_matrix = cache.weights
+            positions = cache.positions
 
+            # Collect the sides that have every vertex group and bone they need
+            armature_index = run.armature_index
+            side_jobs = []
             for bone_name, end_bone_name, third_bone_name in zip(bust_bones, end_bone_names, third_bone_names):
                 source_vg = mesh.vertex_groups.get(bone_name)
-                end_vg = mesh.vertex_groups.get(end_bone_name)
-                third_vg = mesh.vertex_groups.get(third_bone_name) if bone_count == 4 else None
+                end_vg = changes.vertex_group(end_bone_name, create=False)
+                third_vg = changes.vertex_group(third_bone_name, create=False) if bone_count == 4 else None
 
                 if not source_vg:
                     self.report({'WARNING'}, f"Vertex group {bone_name} not found")
@@ -820,103 +2400,103 @@ class VRM_OT_Breast_Physics_Tweaker(bpy.types.Operator):
                     continue
 
                 # Get bone position for distance calculation
-                bone = armature.data.bones.get(bone_name)
-                if not bone:
+                if bone_name not in armature_index:
                     self.report({'WARNING'}, f"Bone {bone_name} not found in armature")
                     continue
-                bone_head = armature.matrix_world @ bone.head_local
-                bone_tail = armature.matrix_world @ bone.tail_local
-                bone_center = (bone_head + bone_tail) / 2
-
-                # Process vertices for source vertex group (increase non-blue weights)
-                selected_verts = []
-                increased_weights = []
-                for v in mesh_data.vertices:
-                    try:
-                        weight = source_vg.weight(v.index)
-                        if weight > 0.0 and weight < 0.2:  # Non-pure blue (assuming blue is low weight < 0.2)
-                            v_pos = mesh.matrix_world @ v.co
-                            dist = (v_pos - bone_center).length
-                            # Increase weight more at center, less at edges
-                            weight_factor = weight_increase - 0.5 * dist
-                            new_weight = weight * weight_factor
-                            new_weight = max(0.0, min(1.0, new_weight))
-                            if new_weight > 0.0:
-                                selected_verts.append(v.index)
-                                increased_weights.append(new_weight)
-                    except RuntimeError:
-                        continue
-
-                # Assign increased weights to source vertex group
-                if selected_verts:
-                    self.report({'INFO'}, f"Adjusted {len(selected_verts)} vertices for {bone_name}")
-                    for v_idx, weight in zip(selected_verts, increased_weights):
-                        source_vg.add([v_idx], weight, 'REPLACE')
-                else:
-                    self.report({'WARNING'}, f"No vertices adjusted for {bone_name}")
-
-                # Process vertices for _end vertex group (shrunk and reduced)
-                end_verts = []
-                end_weights = []
-                for v in mesh_data.vertices:
-                    try:
-                        weight = source_vg.weight(v.index)
-                        if weight > 0.0:
-                            v_pos = mesh.matrix_world @ v.co
-                            dist = (v_pos - bone_center).length
-                            # Shrink influence by user-defined factor
-                            if dist < 0.3:
-                                new_weight = weight * end_shrink_factor * end_weight_reduction
-                                new_weight = max(0.0, min(1.0, new_weight))
-                                if new_weight > 0.0:
-                                    end_verts.append(v.index)
-                                    end_weights.append(new_weight)
-                    except RuntimeError:
-                        continue
-
-                # Assign weights to _end vertex group
-                if end_verts:
-                    self.report({'INFO'}, f"Assigned {len(end_verts)} vertices to {end_bone_name}")
-                    for v_idx, weight in zip(end_verts, end_weights):
-                        end_vg.add([v_idx], weight, 'REPLACE')
+                bone_center = armature_index.center(bone_name)
+                side_jobs.append((source_vg, end_vg, third_vg, bone_center, None))
+
+            # Compute the left side only and mirror it when the right Bust2 weights are its mirror image
+            if context.scene.vrm_use_mirror and len(side_jobs) == 2 and side_jobs[1][0].name == mirror_name(side_jobs[0][0].name):
+                mirror_map = cache.mirror_map(context.scene.vrm_mirror_tolerance)
+                left_job, right_job = side_jobs
+                mismatch, total = mirror_map.group_mismatch(weight_matrix, left_job[0], right_job[0])
+                # Weights come from the bone centres too, so the bones have to mirror each other as well
+                if not mirror_map.points_mirrored(left_job[3], right_job[3]):
+                    self.report({'WARNING'}, f"{left_job[0].name} and {right_job[0].name} bones are not symmetric, computing both sides")
+                elif mirror_map.symmetric_enough(mismatch, total):
+                    side_jobs = [left_job[:4] + ((mirror_map, right_job[:3]),)]
+                    self.report({'INFO'}, f"Mirroring {left_job[0].name} results to {right_job[0].name} ({mismatch} of {total} vertices differ)")
                 else:
-                    self.report({'WARNING'}, f"No vertices assigned to {end_bone_name}")
-
-                # Process vertices for _3 vertex group (further shrunk and reduced) if bone_count is 4
-                if bone_count == 4:
-                    third_verts = []
-                    third_weights = []
-                    for v in mesh_data.vertices:
-                        try:
-                            weight = source_vg.weight(v.index)
-                            if weight > 0.0:
-                                v_pos = mesh.matrix_world @ v.co
-                                dist = (v_pos - bone_center).length
-                                # Further shrink influence for _3 (tighter radius, more reduction)
-                                if dist < 0.2:
-                                    new_weight = weight * end_shrink_factor * 0.5 * end_weight_reduction
-                                    new_weight = max(0.0, min(1.0, new_weight))
-                                    if new_weight > 0.0:
-                                        third_verts.append(v.index)
-                                        third_weights.append(new_weight)
-                        except RuntimeError:
-                            continue
-
-                    # Assign weights to _3 vertex group
-                    if third_verts:
-                        self.report({'INFO'}, f"Assigned {len(third_verts)} vertices to {third_bone_name}")
-                        for v_idx, weight in zip(third_verts, third_weights):
-                            third_vg.add([v_idx], weight, 'REPLACE')
-                    else:
-                        self.report({'WARNING'}, f"No vertices assigned to {third_bone_name}")
-
+                    self.report({'WARNING'}, f"{left_job[0].name} and {right_job[0].name} are not symmetric ({mismatch} of {total} vertices differ), computing both sides")
+
+            if context.scene.vrm_breast_tweaker_engine == 'FUSED':
+                # One distance evaluation over the Bust2 members of both sides
+                members = [weight_matrix.members(source_vg) for source_vg, _, _, _, _ in side_jobs]
+                counts = [len(verts) for verts, _ in members]
+                all_verts = np.concatenate([verts for verts, _ in members] + [np.empty(0, dtype=np.int32)])
+                all_weights = np.concatenate([weights for _, weights in members] + [np.empty(0, dtype=np.float32)])
+                centers = np.repeat(np.array([job[3] for job in side_jobs]).reshape(-1, 3), counts, axis=0)
+                dist = np.linalg.norm(positions[all_verts] - centers, axis=1)
+                results = fused_breast_weights(all_weights, dist, weight_increase, end_shrink_factor, end_weight_reduction, bone_count)
+
+                offsets = np.cumsum([0] + counts)
+                for (source_vg, end_vg, third_vg, _, mirror), start, stop in zip(side_jobs, offsets[:-1], offsets[1:]):
+                    verts = all_verts[start:stop]
+                    for group_idx, ((keep, new_weights), adjusted) in enumerate(zip(results, (True, False, False))):
+                        vertex_group = (source_vg, end_vg, third_vg)[group_idx]
+                        self._assign(cache, vertex_group, verts[keep[start:stop]], new_weights[start:stop][keep[start:stop]], adjusted, self._mirror_target(mirror, group_idx))
+            else:
+                # Reference path: three scans per side, each reading the weights the previous one wrote
+                for source_vg, end_vg, third_vg, bone_center, mirror in side_jobs:
+                    # Process vertices for source vertex group (increase non-blue weights)
+                    source_verts, source_weights = weight_matrix.members(source_vg)
+                    dist = np.linalg.norm(positions[source_verts] - bone_center, axis=1)
+                    # Increase weight more at center, less at edges
+                    new_weights = np.clip(source_weights * (weight_increase - 0.5 * dist), 0.0, 1.0)
+                    # Non-pure blue only (assuming blue is low weight < 0.2)
+                    keep = (source_weights < 0.2) & (new_weights > 0.0)
+                    self._assign(cache, source_vg, source_verts[keep], new_weights[keep], True, self._mirror_target(mirror, 0))
+
+                    # Process vertices for _end vertex group (shrunk and reduced)
+                    source_verts, source_weights = weight_matrix.members(source_vg)
+                    near = np.isin(source_verts, cache.spatial_index.find_range(bone_center, 0.3))
+                    # Shrink influence by user-defined factor
+                    new_weights = np.clip(source_weights * end_shrink_factor * end_weight_reduction, 0.0, 1.0)
+                    keep = near & (new_weights > 0.0)
+                    self._assign(cache, end_vg, source_verts[keep], new_weights[keep], False, self._mirror_target(mirror, 1))
+
+                    # Process vertices for _3 vertex group (further shrunk and reduced) if bone_count is 4
+                    if bone_count == 4:
+                        source_verts, source_weights = weight_matrix.members(source_vg)
+                        near = np.isin(source_verts, cache.spatial_index.find_range(bone_center, 0.2))
+                        # Further shrink influence for _3 (tighter radius, more reduction)
+                        new_weights = np.clip(source_weights * end_shrink_factor * 0.5 * end_weight_reduction, 0.0, 1.0)
+                        keep = near & (new_weights > 0.0)
+                        self._assign(cache, third_vg, source_verts[keep], new_weights[keep], False, self._mirror_target(mirror, 2))
+
+            # Bones, groups, joints and every computed weight are written in one commit
             self.report({'INFO'}, f"Breast physics tweaked successfully with {bone_count} bones per breast")
-            return {'FINISHED'}
+            return run.complete(self)
         except Exception as e:
             self.report({'ERROR'}, f"Error: {str(e)}")
             bpy.ops.object.mode_set(mode='OBJECT')
             return {'CANCELLED'}
 
+    def _mirror_target(self, mirror, group_idx):
+        # (mirror map, right-side group) for one of the Bust2/_end/_3 groups, None when not mirroring
+        if mirror is None:
+            return None
+        mirror_map, groups = mirror
+        return (mirror_map, groups[group_idx])
+
+    def _assign(self, cache, vertex_group, verts, weights, adjusted=False, mirror=None):
+        # Queue the weights for one group and report it the same way for both engines
+        if mirror is not None:
+            mirror_map, mirror_vg = mirror
+            mirror_verts, mirror_weights, _ = mirror_map.mirror_weights(verts, weights)
+            self._assign(cache, mirror_vg, mirror_verts, mirror_weights, adjusted)
+        if len(verts):
+            if adjusted:
+                self.report({'INFO'}, f"Adjusted {len(verts)} vertices for {vertex_group.name}")
+            else:
+                self.report({'INFO'}, f"Assigned {len(verts)} vertices to {vertex_group.name}")
+            cache.writer.add(vertex_group, verts, weights)
+        elif adjusted:
+            self.report({'WARNING'}, f"No vertices adjusted for {vertex_group.name}")
+        else:
+            self.report({'WARNING'}, f"No vertices assigned to {vertex_group.name}")
+
 
 class VRM_OT_Add_Long_Hair_Collider(bpy.types.Operator):
     """Adds a long hair body penetration prevention collider"""
@@ -927,27 +2507,21 @@ class VRM_OT_Add_Long_Hair_Collider(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
+            run = RunContext.acquire(self)
+            armature = run.armature
             bpy.context.view_layer.objects.active = armature
-            sb = armature.data.vrm_addon_extension.spring_bone1
+            spring_index = run.spring_index
+            changes = run.changes
 
-            capsule_collider = sb.colliders.add()
-            capsule_collider.node.bone_name = "J_Bip_C_Chest"
-            capsule_collider.shape_type = "Capsule"
-            capsule_collider.shape.capsule.radius = 0.12
-            capsule_collider.shape.capsule.offset = [0.0, -0.08, 0.0]
-            capsule_collider.shape.capsule.tail = [0.0, 0.14, 0.0]
+            changes.add_collider("J_Bip_C_Chest", "Capsule", radius=0.12, offset=[0.0, -0.08, 0.0], tail=[0.0, 0.14, 0.0])
 
-            new_group = sb.collider_groups.add()
-            new_group.vrm_name = "LongHairHelper"
-            new_group.colliders.add().collider_name = "J_Bip_C_Chest"
+            changes.add_collider_group("LongHairHelper", ["J_Bip_C_Chest"])
 
-            for spring in sb.springs:
-                if "Hair" in spring.vrm_name:
-                    spring.collider_groups.add().collider_group_name = "LongHairHelper"
+            for spring_pos, spring in spring_index.springs('HAIR'):
+                changes.add_spring_collider_group(spring_pos, "LongHairHelper")
 
             self.report({'INFO'}, "Long Hair Body Penetration Prevention added successfully")
-            return {'FINISHED'}
+            return run.complete(self)
         except Exception as e:
             self.report({'ERROR'}, f"Error: {str(e)}")
             return {'CANCELLED'}
@@ -961,9 +2535,10 @@ class VRM_OT_Add_Arm_Hand_Colliders(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
+            run = RunContext.acquire(self)
+            armature = run.armature
             bpy.context.view_layer.objects.active = armature
-            sb = armature.data.vrm_addon_extension.spring_bone1
+            spring_index = run.spring_index
 
             arm_colliders = [
                 ("J_Bip_L_UpperArm", "Capsule", 0.043, [0, 0, 0], [0, 0.2, 0]),
@@ -974,35 +2549,20 @@ class VRM_OT_Add_Arm_Hand_Colliders(bpy.types.Operator):
                 ("J_Bip_R_Hand", "Sphere", 0.054, [0.000003, 0.08, 0], None),
             ]
 
-            left_group = sb.collider_groups.add()
-            left_group.vrm_name = "LeftArmColliders"
-            right_group = sb.collider_groups.add()
-            right_group.vrm_name = "RightArmColliders"
-
+            changes = run.changes
             for bone, shape, radius, offset, tail in arm_colliders:
-                collider = sb.colliders.add()
-                collider.node.bone_name = bone
+                # The collider keeps its default type, only its capsule or sphere settings are filled in
+                changes.add_collider(bone, values_shape_type=shape, radius=radius, offset=offset, tail=tail)
 
-                if shape == "Capsule":
-                    collider.shape.capsule.radius = radius
-                    collider.shape.capsule.offset = offset
-                    collider.shape.capsule.tail = tail
-                else:
-                    collider.shape.sphere.radius = radius
-                    collider.shape.sphere.offset = offset
-
-                if "L_" in bone:
-                    left_group.colliders.add().collider_name = bone
-                else:
-                    right_group.colliders.add().collider_name = bone
+            changes.add_collider_group("LeftArmColliders", [bone for bone, *_ in arm_colliders if "L_" in bone])
+            changes.add_collider_group("RightArmColliders", [bone for bone, *_ in arm_colliders if "L_" not in bone])
 
-            for spring in sb.springs:
-                if "Hair" in spring.vrm_name:
-                    spring.collider_groups.add().collider_group_name = "LeftArmColliders"
-                    spring.collider_groups.add().collider_group_name = "RightArmColliders"
+            for spring_pos, spring in spring_index.springs('HAIR'):
+                changes.add_spring_collider_group(spring_pos, "LeftArmColliders")
+                changes.add_spring_collider_group(spring_pos, "RightArmColliders")
 
             self.report({'INFO'}, "Arms and hand colliders added successfully")
-            return {'FINISHED'}
+            return run.complete(self)
         except Exception as e:
             self.report({'ERROR'}, f"Error: {str(e)}")
             return {'CANCELLED'}
@@ -1016,10 +2576,12 @@ class VRM_OT_Add_Long_Dress_Collision(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
-            mesh = next(obj for obj in armature.children if obj.type == 'MESH')
+            run = RunContext.acquire(self)
+            armature = run.armature
+            mesh = run.mesh
             bpy.context.view_layer.objects.active = armature
-            sb = armature.data.vrm_addon_extension.spring_bone1
+            spring_index = run.spring_index
+            changes = run.changes
 
             # Define the leg and foot bones
             upper_leg_bones = ["J_Bip_L_UpperLeg", "J_Bip_R_UpperLeg"]
@@ -1040,89 +2602,59 @@ class VRM_OT_Add_Long_Dress_Collision(bpy.types.Operator):
             upper_leg_collider_radius = context.scene.vrm_upper_leg_collider_multiplier * context.scene.vrm_dress_collider_radius
             for bone in upper_leg_bones:
                 # Check for existing colliders
-                existing_colliders = [c for c in sb.colliders if c.node.bone_name == bone]
-                if existing_colliders:
-                    for collider in existing_colliders:
+                existing_positions = spring_index.collider_positions(bone)
+                if existing_positions:
+                    for collider_pos in existing_positions:
+                        collider = spring_index.spring_bone.colliders[collider_pos]
                         if collider.shape_type == "Sphere":
-                            collider.shape.sphere.radius *= context.scene.vrm_upper_leg_collider_multiplier
+                            changes.edit_collider(collider_pos, "Sphere", radius=collider.shape.sphere.radius * context.scene.vrm_upper_leg_collider_multiplier)
                         elif collider.shape_type == "Capsule":
-                            collider.shape.capsule.radius *= context.scene.vrm_upper_leg_collider_multiplier
+                            changes.edit_collider(collider_pos, "Capsule", radius=collider.shape.capsule.radius * context.scene.vrm_upper_leg_collider_multiplier)
                         created_colliders[bone].append(collider.node.bone_name)
                         self.report({'INFO'}, f"Multiplied radius of existing collider for {bone} by {context.scene.vrm_upper_leg_collider_multiplier}")
                 else:
-                    # Create new sphere collider
-                    collider = sb.colliders.add()
+                    # Create new sphere collider, centered at the bone head
                     collider_name = f"{bone}_UpperLeg"
-                    collider.node.bone_name = bone
-                    collider.shape.sphere.radius = upper_leg_collider_radius
-                    collider.shape.sphere.offset = [0.0, 0.0, 0.0]  # Center at bone head
+                    changes.add_collider(bone, radius=upper_leg_collider_radius, offset=[0.0, 0.0, 0.0])
                     created_colliders[bone].append(collider_name)
                     self.report({'INFO'}, f"Created new collider for {bone} with radius {upper_leg_collider_radius}")
 
             # Create colliders for lower leg bones
             for bone in lower_leg_bones:
                 for config in collider_configs:
-                    collider = sb.colliders.add()
                     collider_name = f"{bone}{config['suffix']}"
-                    collider.node.bone_name = bone
-                    collider.shape.sphere.radius = context.scene.vrm_dress_collider_radius
-                    collider.shape.sphere.offset = config['offset']
+                    changes.add_collider(bone, radius=context.scene.vrm_dress_collider_radius, offset=config['offset'])
                     created_colliders[bone].append(collider_name)
 
             # Create colliders for foot bones
             for bone in foot_bones:
                 for config in foot_collider_config:
-                    collider = sb.colliders.add()
                     collider_name = f"{bone}{config['suffix']}"
-                    collider.node.bone_name = bone
-                    collider.shape.sphere.radius = context.scene.vrm_dress_collider_radius
-                    collider.shape.sphere.offset = config['offset']
+                    changes.add_collider(bone, radius=context.scene.vrm_dress_collider_radius, offset=config['offset'])
                     created_colliders[bone].append(collider_name)
 
             # Create collider groups for each bone
             for bone in upper_leg_bones + lower_leg_bones + foot_bones:
-                group = sb.collider_groups.add()
-                group.vrm_name = bone
-                for collider_name in created_colliders[bone]:
-                    group_collider = group.colliders.add()
-                    group_collider.collider_name = collider_name
+                changes.add_collider_group(bone, created_colliders[bone])
 
             # Assign collider groups to springs containing "Skirt" but not "SkirtBack" in their name
-            for spring in sb.springs:
-                if "Skirt" in spring.vrm_name and "SkirtBack" not in spring.vrm_name:
-                    for bone in upper_leg_bones + lower_leg_bones + foot_bones:
-                        collider_group = spring.collider_groups.add()
-                        collider_group.collider_group_name = bone
-
-            # Update properties for Skirt Spring Bone Springs, excluding SkirtBack
-            for spring in sb.springs:
-                if "Skirt" in spring.vrm_name and "SkirtBack" not in spring.vrm_name:
-                    for idx, joint in enumerate(spring.joints):
-                        if idx == 0:
-                            joint.radius = context.scene.vrm_skirt_hit_radius_first
-                            joint.drag_force = min(max(context.scene.vrm_skirt_drag_force_first, 0.0), 1.0)
-                            joint.stiffness = context.scene.vrm_skirt_stiffness_first
-                            joint.angular_stiffness = min(max(context.scene.vrm_skirt_angular_stiffness_first, 0.3), 1.0)
-                        elif idx == 1:
-                            joint.radius = context.scene.vrm_skirt_hit_radius_second
-                            joint.drag_force = min(max(context.scene.vrm_skirt_drag_force_second, 0.0), 1.0)
-                            joint.stiffness = context.scene.vrm_skirt_stiffness_second
-                            joint.angular_stiffness = min(max(context.scene.vrm_skirt_angular_stiffness_second, 0.3), 1.0)
-                        elif idx == 2:
-                            joint.radius = context.scene.vrm_skirt_hit_radius_third
-                            joint.drag_force = min(max(context.scene.vrm_skirt_drag_force_third, 0.0), 1.0)
-                            joint.stiffness = context.scene.vrm_skirt_stiffness_third
-                            joint.angular_stiffness = min(max(context.scene.vrm_skirt_angular_stiffness_third, 0.3), 1.0)
-                        else:
-                            joint.radius = context.scene.vrm_skirt_hit_radius_fourth
-                            joint.drag_force = min(max(context.scene.vrm_skirt_drag_force_fifth, 0.0), 1.0)
-                            joint.stiffness = context.scene.vrm_skirt_stiffness_fourth
-                            joint.angular_stiffness = min(max(context.scene.vrm_skirt_angular_stiffness_fourth, 0.3), 1.0)
-                        joint.gravity_power = context.scene.vrm_skirt_gravity_power_first if idx == 0 else context.scene.vrm_skirt_gravity_power_rest
+            skirt_springs = [(spring_pos, spring) for spring_pos, spring in spring_index.springs('SKIRT') if "SkirtBack" not in spring.vrm_name]
+            for spring_pos, spring in skirt_springs:
+                for bone in upper_leg_bones + lower_leg_bones + foot_bones:
+                    changes.add_spring_collider_group(spring_pos, bone)
+
+            # Update properties for Skirt Spring Bone Springs, excluding SkirtBack, by joint depth
+            changes.apply_joint_profile([spring_pos for spring_pos, _ in skirt_springs], skirt_joint_profile(context.scene))
+            joint_count = sum(len(spring.joints) for _, spring in skirt_springs)
+            self.report({'INFO'}, f"Updating {joint_count} joint(s) in {len(skirt_springs)} Skirt spring(s)")
 
             # Weight painting for skirt and lower leg vertex groups
             bpy.context.view_layer.objects.active = mesh
-            mesh_data = mesh.data
+            cache = run.mesh_cache
+            weight_matrix = cache.weights
+            positions = cache.positions
+            armature_index = run.armature_index
+            diagnostics = Diagnostics.from_scene(self, context.scene)
 
             # Define skirt vertex group pairs (0_01 and 1_01), excluding SkirtBack
             skirt_vg_pairs = [
@@ -1131,6 +2663,7 @@ class VRM_OT_Add_Long_Dress_Collision(bpy.types.Operator):
             ]
 
             # Process skirt vertex groups (0_01 to 1_01)
+            diagnostics.begin_phase("Skirt 0_01 weights")
             for target_vg_name, source_vg_name in skirt_vg_pairs:
                 source_vg = mesh.vertex_groups.get(source_vg_name)
                 target_vg = mesh.vertex_groups.get(target_vg_name)
@@ -1139,63 +2672,46 @@ class VRM_OT_Add_Long_Dress_Collision(bpy.types.Operator):
                     self.report({'WARNING'}, f"Source vertex group {source_vg_name} not found")
                     continue
                 if not target_vg:
-                    target_vg = mesh.vertex_groups.new(name=target_vg_name)
-                    self.report({'INFO'}, f"Created vertex group {target_vg_name}")
-
-                # Attempt to find the closest matching bone by removing suffixes
-                bone_name_base = source_vg_name.replace("J_Sec_", "J_Sec_").replace("1_01", "")
-                bone = None
-                for b in armature.data.bones:
-                    if bone_name_base in b.name:
-                        bone = b
-                        break
-                if not bone:
-                    self.report({'WARNING'}, f"No matching bone found for {source_vg_name} (tried {bone_name_base})")
+                    target_vg = changes.vertex_group(target_vg_name)
+                    self.report({'INFO'}, f"Planned vertex group {target_vg_name}")
+
+                # The falloff is measured from the row 0 bone, the first chain bone in VRoid order that the name lookup always found
+                bone_name = armature_index.resolve(target_vg_name)
+                if not bone_name:
+                    self.report({'WARNING'}, f"No matching bone found for {target_vg_name}")
                     continue
 
-                bone_head = armature.matrix_world @ bone.head_local
-                bone_tail = armature.matrix_world @ bone.tail_local
-                z_min = min(bone_head.z, bone_tail.z)
-                z_max = max(bone_head.z, bone_tail.z)
+                z_min = min(armature_index.head(bone_name)[2], armature_index.tail(bone_name)[2])
+                z_max = max(armature_index.head(bone_name)[2], armature_index.tail(bone_name)[2])
                 z_range = z_max - z_min
 
                 # Collect vertices from source vertex group
-                selected_verts = []
-                weights = []
-                for v in mesh_data.vertices:
-                    try:
-                        weight = source_vg.weight(v.index)
-                        if weight > 0.0:
-                            v_pos = mesh.matrix_world @ v.co
-                            # Base weight is middling (0.5)
-                            new_weight = 0.5
-                            # Apply falloff for vertices below the bone
-                            if v_pos.z < z_min:
-                                dist_below = z_min - v_pos.z
-                                falloff = math.exp(-dist_below / (0.1 * z_range))
-                                new_weight *= falloff
-                            new_weight = max(0.0, min(1.0, new_weight))
-                            if new_weight > 0.0:
-                                selected_verts.append(v.index)
-                                weights.append(new_weight)
-                    except RuntimeError:
-                        continue
+                source_verts, _ = weight_matrix.members(source_vg)
+                v_z = positions[source_verts, 2]
+                # Base weight is middling (0.5), with falloff for vertices below the bone
+                dist_below = np.maximum(z_min - v_z, 0.0)
+                new_weights = np.clip(0.5 * np.exp(-dist_below / (0.1 * z_range)), 0.0, 1.0)
+                keep = new_weights > 0.0
+                selected_verts = source_verts[keep].tolist()
+                weights = new_weights[keep].tolist()
 
                 # Assign weights to target vertex group
                 if selected_verts:
-                    self.report({'INFO'}, f"Assigned {len(selected_verts)} vertices to {target_vg_name}")
-                    for v_idx, weight in zip(selected_verts, weights):
-                        target_vg.add([v_idx], weight, 'REPLACE')
+                    diagnostics.record(target_vg_name, selected_verts, weights)
+                    cache.writer.add(target_vg, selected_verts, weights)
                 else:
                     self.report({'WARNING'}, f"No vertices assigned to {target_vg_name}")
 
             # Find skirt end vertex groups (containing "Skirt" and "end_01", excluding "SkirtBack")
             skirt_end_vertex_groups = [vg for vg in mesh.vertex_groups if "Skirt" in vg.name and "end_01" in vg.name and "SkirtBack" not in vg.name]
             if not skirt_end_vertex_groups:
+                diagnostics.finish()
                 self.report({'WARNING'}, "No vertex groups containing 'Skirt' and 'end_01' (excluding 'SkirtBack') found")
                 return {'CANCELLED'}
 
             # Transfer weights to _end_01 vertex groups from their corresponding _01 groups
+            diagnostics.begin_phase("Skirt end_01 weights")
+            smoothed_end_groups = []
             for end_vg in skirt_end_vertex_groups:
                 # Derive the source vertex group name by replacing "end_01" with "01"
                 source_vg_name = end_vg.name.replace("end_01", "01")
@@ -1205,167 +2721,105 @@ class VRM_OT_Add_Long_Dress_Collision(bpy.types.Operator):
                     self.report({'WARNING'}, f"Source vertex group {source_vg_name} not found for {end_vg.name}")
                     continue
 
-                # Attempt to find the closest matching bone
-                bone_name_base = source_vg_name.replace("J_Sec_", "J_Sec_").replace("_01", "")
-                bone = None
-                for b in armature.data.bones:
-                    if bone_name_base in b.name:
-                        bone = b
-                        break
-                if not bone:
-                    self.report({'WARNING'}, f"No matching bone found for {source_vg_name} (tried {bone_name_base})")
+                # The bone named like the group, or the first bone of the same chain row
+                bone_name = armature_index.resolve(source_vg_name)
+                if not bone_name:
+                    self.report({'WARNING'}, f"No matching bone found for {source_vg_name}")
                     continue
 
-                bone_head = armature.matrix_world @ bone.head_local
-                bone_tail = armature.matrix_world @ bone.tail_local
-                z_min = min(bone_head.z, bone_tail.z)
-                z_max = max(bone_head.z, bone_tail.z)
+                z_min = min(armature_index.head(bone_name)[2], armature_index.tail(bone_name)[2])
+                z_max = max(armature_index.head(bone_name)[2], armature_index.tail(bone_name)[2])
                 z_range = z_max - z_min
                 z_mid = (z_min + z_max) / 2  # Midpoint for selection threshold
 
                 # Collect vertices from source vertex group, but only those below the Z midpoint
-                selected_verts = []
-                weights = []
-                for v in mesh_data.vertices:
-                    try:
-                        weight = source_vg.weight(v.index)
-                        if weight > 0.0:
-                            v_pos = mesh.matrix_world @ v.co
-                            # Only select vertices below the Z midpoint
-                            if v_pos.z <= z_mid:
-                                normalized_z = (z_mid - v_pos.z) / (z_mid - z_min) if (z_mid - z_min) != 0 else 0.0
-                                # Use a fourth-power falloff for a smoother gradient
-                                new_weight = (normalized_z ** 4) * 0.1 + 0.03
-                                new_weight = max(0.0, min(1.0, new_weight))
-                                if new_weight > 0.0:
-                                    selected_verts.append(v.index)
-                                    weights.append(new_weight)
-                    except RuntimeError:
-                        continue
+                source_verts, _ = weight_matrix.members(source_vg)
+                v_z = positions[source_verts, 2]
+                below = v_z <= z_mid
+                normalized_z = (z_mid - v_z[below]) / (z_mid - z_min) if (z_mid - z_min) != 0 else np.zeros(np.count_nonzero(below))
+                # Use a fourth-power falloff for a smoother gradient
+                new_weights = np.clip((normalized_z ** 4) * 0.1 + 0.03, 0.0, 1.0)
+                keep = new_weights > 0.0
+                selected_verts = source_verts[below][keep].tolist()
+                weights = new_weights[keep].tolist()
 
                 # Assign weights to the _end_01 vertex group
                 if selected_verts:
-                    self.report({'INFO'}, f"Assigned {len(selected_verts)} vertices to {end_vg.name}")
-                    for v_idx, weight in zip(selected_verts, weights):
-                        end_vg.add([v_idx], weight, 'REPLACE')
+                    diagnostics.record(end_vg.name, selected_verts, weights)
+                    cache.writer.add(end_vg, selected_verts, weights)
                 else:
                     self.report({'WARNING'}, f"No vertices assigned to {end_vg.name}")
 
-                # Smooth the weights for _end_01 vertex group
-                bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
-                bpy.context.object.data.use_paint_mask_vertex = True
-                bpy.ops.object.vertex_group_smooth(group_select_mode='ACTIVE', factor=0.5, repeat=3, expand=0.0)
-                bpy.ops.object.mode_set(mode='OBJECT')
+                smoothed_end_groups.append(end_vg)
+
+            # Smooth the weights for all _end_01 vertex groups in memory
+            smooth_vertex_groups(cache, smoothed_end_groups, factor=0.5, repeat=3, expand=0.0)
 
             # Get or create lower leg vertex groups
             left_leg_vg = mesh.vertex_groups.get("J_Bip_L_LowerLeg")
             if not left_leg_vg:
-                left_leg_vg = mesh.vertex_groups.new(name="J_Bip_L_LowerLeg")
-                self.report({'INFO'}, "Created vertex group J_Bip_L_LowerLeg")
+                left_leg_vg = changes.vertex_group("J_Bip_L_LowerLeg")
+                self.report({'INFO'}, "Planned vertex group J_Bip_L_LowerLeg")
             right_leg_vg = mesh.vertex_groups.get("J_Bip_R_LowerLeg")
             if not right_leg_vg:
-                right_leg_vg = mesh.vertex_groups.new(name="J_Bip_R_LowerLeg")
-                self.report({'INFO'}, "Created vertex group J_Bip_R_LowerLeg")
+                right_leg_vg = changes.vertex_group("J_Bip_R_LowerLeg")
+                self.report({'INFO'}, "Planned vertex group J_Bip_R_LowerLeg")
 
             # Get lower leg bone positions
-            left_bone = armature.data.bones.get("J_Bip_L_LowerLeg")
-            right_bone = armature.data.bones.get("J_Bip_R_LowerLeg")
-            if not left_bone or not right_bone:
+            leg_bones = ["J_Bip_L_LowerLeg", "J_Bip_R_LowerLeg"]
+            if not all(bone in armature_index for bone in leg_bones):
+                diagnostics.finish()
                 self.report({'WARNING'}, "Lower leg bones not found")
                 return {'CANCELLED'}
 
-            left_bone_head = armature.matrix_world @ left_bone.head_local
-            left_bone_tail = armature.matrix_world @ left_bone.tail_local
-            left_bone_dir = (left_bone_tail - left_bone_head).normalized()
-            right_bone_head = armature.matrix_world @ right_bone.head_local
-            right_bone_tail = armature.matrix_world @ right_bone.tail_local
-            right_bone_dir = (right_bone_tail - right_bone_head).normalized()
+            # Lower leg segments in world space, left first
+            leg_indices = [armature_index.index(bone) for bone in leg_bones]
+            segment_heads = armature_index.heads[leg_indices]
+            segment_tails = armature_index.tails[leg_indices]
 
             # Parameters for weight gradient and selection radius
             selection_radius = 0.3  # Increased to widen affected area
             decay_factor = 0.15     # Adjusted for smoother falloff
 
-            # Process vertices from skirt end vertex groups
-            left_leg_verts = []
-            left_leg_weights = []
-            right_leg_verts = []
-            right_leg_weights = []
+            # Collect vertices from skirt end vertex groups
+            diagnostics.begin_phase("Lower leg assignment")
+            group_verts = [np.empty(0, dtype=np.int32)]
             for vg in skirt_end_vertex_groups:
-                self.report({'INFO'}, f"Processing skirt end vertex group: {vg.name}")
-                vg_verts = []
-                for v in mesh_data.vertices:
-                    try:
-                        weight = vg.weight(v.index)
-                        if weight > 0.0:
-                            vg_verts.append(v)
-                    except RuntimeError:
-                        continue
-                self.report({'INFO'}, f"Found {len(vg_verts)} vertices with weight > 0 in {vg.name}")
-
-                for v in vg_verts:
-                    v_pos = mesh.matrix_world @ v.co
-
-                    # Compute distance to left leg bone
-                    vec_to_vertex_left = v_pos - left_bone_head
-                    t_left = vec_to_vertex_left.dot(left_bone_dir)
-                    t_left = max(0, min(t_left, (left_bone_tail - left_bone_head).length))
-                    closest_point_left = left_bone_head + t_left * left_bone_dir
-                    dist_left = (v_pos - closest_point_left).length
-
-                    # Compute distance to right leg bone
-                    vec_to_vertex_right = v_pos - right_bone_head
-                    t_right = vec_to_vertex_right.dot(right_bone_dir)
-                    t_right = max(0, min(t_right, (right_bone_tail - right_bone_head).length))
-                    closest_point_right = right_bone_head + t_right * right_bone_dir
-                    dist_right = (v_pos - closest_point_right).length
-
-                    # Select leg based on closer distance, use X-coordinate as tiebreaker
-                    if dist_left < dist_right or (dist_left == dist_right and v_pos.x > 0):
-                        if dist_left <= selection_radius:
-                            new_weight = math.exp(-dist_left / decay_factor)
-                            new_weight = max(0.0, min(1.0, new_weight))
-                            if new_weight > 0.0:
-                                left_leg_verts.append(v.index)
-                                left_leg_weights.append(new_weight)
-                                self.report({'INFO'}, f"Vertex {v.index} assigned to left leg, distance: {dist_left:.3f}, weight: {new_weight:.3f}")
-                    else:
-                        if dist_right <= selection_radius:
-                            new_weight = math.exp(-dist_right / decay_factor)
-                            new_weight = max(0.0, min(1.0, new_weight))
-                            if new_weight > 0.0:
-                                right_leg_verts.append(v.index)
-                                right_leg_weights.append(new_weight)
-                                self.report({'INFO'}, f"Vertex {v.index} assigned to right leg, distance: {dist_right:.3f}, weight: {new_weight:.3f}")
+                group_verts.append(weight_matrix.members(vg)[0])
+            skirt_end_verts = np.unique(np.concatenate(group_verts))
+
+            # Classify every skirt end vertex against both lower legs at once
+            points = positions[skirt_end_verts]
+            nearest, nearest_dist, new_weights, segment_dist = classify_to_bone_segments(points, segment_heads, segment_tails, selection_radius, decay_factor)
+            # Equal distances go to the left leg only on the +X side
+            tied = segment_dist[:, 0] == segment_dist[:, 1]
+            nearest[tied] = np.where(points[tied, 0] > 0, 0, 1)
+
+            assigned = new_weights > 0.0
+            left = assigned & (nearest == 0)
+            right = assigned & (nearest == 1)
+            left_leg_verts = skirt_end_verts[left].tolist()
+            left_leg_weights = new_weights[left].tolist()
+            right_leg_verts = skirt_end_verts[right].tolist()
+            right_leg_weights = new_weights[right].tolist()
+            diagnostics.record("J_Bip_L_LowerLeg", left_leg_verts, left_leg_weights, nearest_dist[left])
+            diagnostics.record("J_Bip_R_LowerLeg", right_leg_verts, right_leg_weights, nearest_dist[right])
 
             # Assign weights to lower leg vertex groups
-            if left_leg_verts:
-                self.report({'INFO'}, f"Assigned weights to {len(left_leg_verts)} vertices in J_Bip_L_LowerLeg")
-                for v_idx, w in zip(left_leg_verts, left_leg_weights):
-                    left_leg_vg.add([v_idx], w, 'REPLACE')
-                # Smooth the weights for the left leg vertex group
-                bpy.context.object.vertex_groups.active = left_leg_vg
-                bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
-                bpy.context.object.data.use_paint_mask_vertex = True
-                bpy.ops.object.vertex_group_smooth(group_select_mode='ACTIVE', factor=0.5, repeat=3, expand=0.0)
-                bpy.ops.object.mode_set(mode='OBJECT')
-            else:
-                self.report({'WARNING'}, "No vertices assigned to J_Bip_L_LowerLeg")
-
-            if right_leg_verts:
-                self.report({'INFO'}, f"Assigned weights to {len(right_leg_verts)} vertices in J_Bip_R_LowerLeg")
-                for v_idx, w in zip(right_leg_verts, right_leg_weights):
-                    right_leg_vg.add([v_idx], w, 'REPLACE')
-                # Smooth the weights for the right leg vertex group
-                bpy.context.object.vertex_groups.active = right_leg_vg
-                bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
-                bpy.context.object.data.use_paint_mask_vertex = True
-                bpy.ops.object.vertex_group_smooth(group_select_mode='ACTIVE', factor=0.5, repeat=3, expand=0.0)
-                bpy.ops.object.mode_set(mode='OBJECT')
-            else:
-                self.report({'WARNING'}, "No vertices assigned to J_Bip_R_LowerLeg")
+            leg_groups = []
+            for leg_vg, leg_verts, leg_weights in ((left_leg_vg, left_leg_verts, left_leg_weights), (right_leg_vg, right_leg_verts, right_leg_weights)):
+                if leg_verts:
+                    cache.writer.add(leg_vg, leg_verts, leg_weights)
+                    leg_groups.append(leg_vg)
+                else:
+                    self.report({'WARNING'}, f"No vertices assigned to {leg_vg.name}")
 
+            # Smooth both lower leg groups in one call, then commit colliders, joints and weights at once
+            smooth_vertex_groups(cache, leg_groups, factor=0.5, repeat=3, expand=0.0)
+
+            diagnostics.finish()
             self.report({'INFO'}, "Long dress collision colliders, Skirt Spring Bone properties, and weight painting updated successfully")
-            return {'FINISHED'}
+            return run.complete(self)
         except Exception as e:
             self.report({'ERROR'}, f"Error: {str(e)}")
             return {'CANCELLED'}
@@ -1379,37 +2833,39 @@ class VRM_OT_Improve_Long_Dress_Topology(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
-            mesh = next(obj for obj in armature.children if obj.type == 'MESH')
+            run = RunContext.acquire(self)
+            mesh = run.mesh
             bpy.context.view_layer.objects.active = mesh
-            mesh_data = mesh.data
             subdivision_count = context.scene.vrm_dress_subdivision_count
             subdivision_smoothness = context.scene.vrm_dress_subdivision_smoothness
-            skirt_vertex_groups = [vg for vg in mesh.vertex_groups if "Skirt" in vg.name]
+            skirt_vertex_groups = vertex_groups_matching(mesh, "*Skirt*")
 
             if not skirt_vertex_groups:
                 self.report({'WARNING'}, "No vertex groups containing 'Skirt' found")
                 return {'CANCELLED'}
 
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_mode(type='VERT')
-            bpy.ops.mesh.select_all(action='DESELECT')
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-            for vg in skirt_vertex_groups:
-                for v in mesh_data.vertices:
-                    try:
-                        vg.weight(v.index)
-                        v.select = True
-                    except RuntimeError:
-                        continue
-
-            if subdivision_count > 0:
-                bpy.ops.object.mode_set(mode='EDIT')
-                for _ in range(subdivision_count):
-                    bpy.ops.mesh.subdivide(smoothness=subdivision_smoothness)
-                bpy.ops.object.mode_set(mode='OBJECT')
+            session = run.session
+            session.set(mesh, 'OBJECT')
+
+            cache = run.mesh_cache
+            changes = run.changes
+            subdivide = subdivision_count > 0 and not changes.dry_run
+            if subdivision_count > 0 and changes.dry_run:
+                # Topology changes cannot be planned, the preview covers the weights on the current mesh
+                skirt_count = int(np.count_nonzero(cache.weights.union_mask(skirt_vertex_groups)))
+                self.report({'INFO'}, f"Dry run: would subdivide {skirt_count} skirt vertices {subdivision_count} time(s), weights below are previewed on the current mesh")
+
+            if subdivide:
+                # Earlier plans refer to the current vertex indices, so they are committed before subdividing
+                changes.commit()
+                # Select every skirt vertex from Object Mode in one write
+                selection = cache.select_groups("*Skirt*")
+                subdivide_region(mesh, selection, subdivision_count, subdivision_smoothness, context.scene.vrm_subdivision_max_edge_length, context.scene.vrm_subdivision_vertex_budget, self)
                 self.report({'INFO'}, f"Subdivided skirt vertex groups {subdivision_count} time(s) with smoothness {subdivision_smoothness}")
+                # Subdivision adds vertices, so positions and memberships are read again afterwards
+                cache.invalidate()
+            weight_matrix = cache.weights
+            positions = cache.positions
 
             sides = ["L", "R"]
             directions = ["Front", "Back"]
@@ -1424,56 +2880,39 @@ class VRM_OT_Improve_Long_Dress_Topology(bpy.types.Operator):
                     self.report({'WARNING'}, f"Source vertex group {source_vg_name} not found")
                     continue
                 if not target_vg:
-                    target_vg = mesh.vertex_groups.new(name=target_vg_name)
-                    self.report({'INFO'}, f"Created vertex group {target_vg_name}")
-
-                z_coords = []
-                source_vertices = []
-                source_weights = []
-                for v in mesh_data.vertices:
-                    try:
-                        weight = source_vg.weight(v.index)
-                        if weight > 0.0:
-                            v_pos = mesh.matrix_world @ v.co
-                            z_coords.append(v_pos.z)
-                            source_vertices.append(v.index)
-                            source_weights.append(weight)
-                    except RuntimeError:
-                        continue
+                    target_vg = changes.vertex_group(target_vg_name)
+                    self.report({'INFO'}, f"Planned vertex group {target_vg_name}")
+
+                source_vertices, _ = weight_matrix.members(source_vg)
+                z_coords = positions[source_vertices, 2]
 
-                if not z_coords:
+                if not z_coords.size:
                     self.report({'WARNING'}, f"No vertices found in {source_vg_name}")
                     continue
 
-                z_min = min(z_coords)
-                z_max = max(z_coords)
+                z_min = float(z_coords.min())
+                z_max = float(z_coords.max())
                 z_mid = (z_min + z_max) / 2
                 z_bound = z_mid
 
-                selected_verts = []
-                weights = []
-                for v_idx, source_weight in zip(source_vertices, source_weights):
-                    v = mesh_data.vertices[v_idx]
-                    v_pos = mesh.matrix_world @ v.co
-                    if v_pos.z <= z_bound:
-                        normalized_z = (z_bound - v_pos.z) / (z_bound - z_min) if z_bound != z_min else 0.0
-                        new_weight = normalized_z
-                        new_weight = max(0.0, min(1.0, new_weight))
-                        if new_weight > 0.0:
-                            selected_verts.append(v_idx)
-                            weights.append(new_weight)
+                if z_bound != z_min:
+                    new_weights = np.clip((z_bound - z_coords) / (z_bound - z_min), 0.0, 1.0)
+                else:
+                    new_weights = np.zeros_like(z_coords)
+                keep = (z_coords <= z_bound) & (new_weights > 0.0)
+                selected_verts = source_vertices[keep].tolist()
+                weights = new_weights[keep].tolist()
 
                 if selected_verts:
                     self.report({'INFO'}, f"Assigned {len(selected_verts)} vertices to {target_vg_name}")
-                    for v_idx, weight in zip(selected_verts, weights):
-                        target_vg.add([v_idx], weight, 'REPLACE')
+                    cache.writer.add(target_vg, selected_verts, weights)
                 else:
                     self.report({'WARNING'}, f"No vertices assigned to {target_vg_name}")
 
             if subdivision_count == 0:
                 self.report({'INFO'}, "Subdivision count is 0, only weight painting applied")
 
-            return {'FINISHED'}
+            return run.complete(self)
         except Exception as e:
             self.report({'ERROR'}, f"Error: {str(e)}")
             bpy.ops.object.mode_set(mode='OBJECT')
@@ -1506,203 +2945,150 @@ class VRM_OT_Add_Jiggle_Bones(bpy.types.Operator):
                 'UPPER_LEG': ["J_Bip_L_UpperLeg", "J_Bip_R_UpperLeg"],
             }
             selected_bones = bone_pairs.get(bone_pair, ["J_Bip_L_UpperLeg", "J_Bip_R_UpperLeg"])
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
-            mesh = next(obj for obj in armature.children if obj.type == 'MESH')
-            bpy.context.view_layer.objects.active = armature
-            bpy.ops.object.mode_set(mode='EDIT')
-            edit_bones = armature.data.edit_bones
+            run = RunContext.acquire(self)
+            armature = run.armature
+            mesh = run.mesh
+            session = run.session
+            changes = run.changes
 
             # Define bone names for back gravity and side jiggle
             for bone_name in selected_bones:
-                if bone_name not in edit_bones:
+                if bone_name not in armature.data.bones:
                     self.report({'WARNING'}, f"Bone {bone_name} not found in armature")
                     continue
-                source_bone = edit_bones[bone_name]
-                bone_length = source_bone.length
-                direction = (source_bone.tail - source_bone.head).normalized()
-
-                # Create back gravity bone (centered along the bone)
-                back_bone_name = f"Jiggle_{bone_name}_Back"
-                if back_bone_name not in edit_bones:
-                    back_bone = edit_bones.new(back_bone_name)
-                    back_bone.head = (source_bone.head + source_bone.tail) / 2
-                    back_bone.tail = back_bone.head + direction * (bone_length * 0.3)  # Short extension for back
-                    back_bone.parent = source_bone
-                    back_bone.use_deform = True
-                    self.report({'INFO'}, f"Created bone {back_bone_name}")
-
-                # Create left and right side jiggle bones (offset laterally)
-                side_bone_names = [f"Jiggle_{bone_name}_Left", f"Jiggle_{bone_name}_Right"]
-                for i, side_bone_name in enumerate(side_bone_names):
-                    if side_bone_name not in edit_bones:
-                        side_bone = edit_bones.new(side_bone_name)
-                        offset = Vector((0.1 if i == 0 else -0.1, 0, 0))  # Lateral offset
-                        side_bone.head = (source_bone.head + source_bone.tail) / 2 + offset
-                        side_bone.tail = side_bone.head + direction * (bone_length * 0.3)
-                        side_bone.parent = source_bone
-                        side_bone.use_deform = True
-                        self.report({'INFO'}, f"Created bone {side_bone_name}")
 
-            bpy.ops.object.mode_set(mode='OBJECT')
-            sb = armature.data.vrm_addon_extension.spring_bone1
+                # Back gravity bone (centered along the bone, short extension for back)
+                changes.queue_bone(armature, f"Jiggle_{bone_name}_Back", bone_name, head_factor=0.5, length_factor=0.3)
+
+                # Left and right side jiggle bones (offset laterally)
+                changes.queue_bone(armature, f"Jiggle_{bone_name}_Left", bone_name, head_factor=0.5, offset=(0.1, 0.0, 0.0), length_factor=0.3)
+                changes.queue_bone(armature, f"Jiggle_{bone_name}_Right", bone_name, head_factor=0.5, offset=(-0.1, 0.0, 0.0), length_factor=0.3)
 
             # Add spring bone settings
+            back_spring_positions = []
+            side_spring_positions = []
             for bone_name in selected_bones:
                 # Back gravity spring
-                back_spring = sb.springs.add()
-                back_spring.vrm_name = f"Jiggle_{bone_name}_Back_Spring"
-                joint = back_spring.joints.add()
-                joint.node.bone_name = f"Jiggle_{bone_name}_Back"
-                joint.stiffness = stiffness_back * 1.2
-                joint.angular_stiffness = angular_stiffness_back * 0.9
-                joint.drag_force = drag_force_back * 0.8
-                joint.radius = joint_radius_back * 1.0
-                joint.gravity_power = gravity_power * 0.8  # Gravity only on back
-                joint.gravity_dir = Vector((0.0, 0.0, -1.0))  # Downward gravity
-                joint.max_angle = math.radians(max_angle * 0.8)
+                back_spring_pos = changes.add_spring(f"Jiggle_{bone_name}_Back_Spring")
+                changes.add_joint(back_spring_pos, f"Jiggle_{bone_name}_Back")
+                back_spring_positions.append(back_spring_pos)
 
                 # Side jiggle springs
                 for side_bone_name in [f"Jiggle_{bone_name}_Left", f"Jiggle_{bone_name}_Right"]:
-                    side_spring = sb.springs.add()
-                    side_spring.vrm_name = f"{side_bone_name}_Spring"
-                    joint = side_spring.joints.add()
-                    joint.node.bone_name = side_bone_name
-                    joint.stiffness = stiffness_side * 0.8
-                    joint.angular_stiffness = angular_stiffness_side * 0.7
-                    joint.drag_force = drag_force_side * 0.6
-                    joint.radius = joint_radius_side * 1.2
-                    joint.gravity_power = 0.0  # No gravity on sides
-                    joint.max_angle = math.radians(max_angle * 1.2)
+                    side_spring_pos = changes.add_spring(f"{side_bone_name}_Spring")
+                    changes.add_joint(side_spring_pos, side_bone_name)
+                    side_spring_positions.append(side_spring_pos)
+
+            # The profiles are written once the planned springs and joints exist
+            changes.apply_joint_profile(back_spring_positions, {
+                "stiffness": stiffness_back * 1.2,
+                "angular_stiffness": angular_stiffness_back * 0.9,
+                "drag_force": drag_force_back * 0.8,
+                "radius": joint_radius_back * 1.0,
+                "gravity_power": gravity_power * 0.8,  # Gravity only on back
+                "gravity_dir": (0.0, 0.0, -1.0),  # Downward gravity
+                "max_angle": math.radians(max_angle * 0.8),
+            })
+            changes.apply_joint_profile(side_spring_positions, {
+                "stiffness": stiffness_side * 0.8,
+                "angular_stiffness": angular_stiffness_side * 0.7,
+                "drag_force": drag_force_side * 0.6,
+                "radius": joint_radius_side * 1.2,
+                "gravity_power": 0.0,  # No gravity on sides
+                "max_angle": math.radians(max_angle * 1.2),
+            })
 
             # Vertex group assignment with localized effects
-            bpy.context.view_layer.objects.active = mesh
+            session.set(mesh, 'OBJECT')
             mesh_data = mesh.data
             hips_vg = mesh.vertex_groups.get("J_Bip_C_Hips")
-            hips_vertices = set()
+            cache = run.mesh_cache
+            hips_vertices = np.zeros(0, dtype=np.int64)
             if hips_vg:
-                for v in mesh_data.vertices:
-                    try:
-                        weight = hips_vg.weight(v.index)
-                        if weight > 0.1:
-                            hips_vertices.add(v.index)
-                    except RuntimeError:
-                        continue
-
-            vertex_neighbors = [set() for _ in range(len(mesh_data.vertices))]
-            for edge in mesh_data.edges:
-                v0, v1 = edge.vertices
-                vertex_neighbors[v0].add(v1)
-                vertex_neighbors[v1].add(v0)
+                hips_vertices = cache.weights.members(hips_vg, min_weight=0.1)[0]
 
-            expanded_hips_vertices = set(hips_vertices)
-            for _ in range(2):
-                new_selection = set(expanded_hips_vertices)
-                for v_idx in expanded_hips_vertices:
-                    new_selection.update(vertex_neighbors[v_idx])
-                expanded_hips_vertices = new_selection
+            # Keep the hips and two rings of neighbours out of the jiggle groups
+            expanded_hips_vertices = np.flatnonzero(cache.adjacency.k_ring(hips_vertices, 2))
+            # The armature transform is the same for every vertex, bone and side
+            world_to_armature = armature.matrix_world.inverted()
 
+            armature_index = run.armature_index
+            bone_centers = []
             for bone_name in selected_bones:
-                bone = armature.data.bones.get(bone_name)
-                if not bone:
+                if bone_name not in armature_index:
                     self.report({'WARNING'}, f"Bone {bone_name} not found in armature")
                     continue
-                bone_head = armature.matrix_world @ bone.head_local
-                bone_tail = armature.matrix_world @ bone.tail_local
-                bone_length = (bone_tail - bone_head).length
-                bone_center = (bone_head + bone_tail) / 2
+                bone_length = armature_index.length(bone_name)
+                bone_center = armature_index.center(bone_name).tolist()
+                bone_centers.append((bone_name, bone_center))
 
                 # Select vertices in lower thigh for subdivision
-                thigh_verts = set()
-                for v in mesh_data.vertices:
-                    v_pos = mesh.matrix_world @ v.co
-                    dist_to_center = (v_pos - bone_center).length
-                    if dist_to_center < bone_length * 0.6:  # Lower 60% of thigh
-                        thigh_verts.add(v.index)
-
-                # Apply subdivision for retopology
-                if subdivision_factor > 0 and thigh_verts:
-                    bpy.ops.object.mode_set(mode='EDIT')
-                    bpy.ops.mesh.select_mode(type='VERT')
-                    bpy.ops.mesh.select_all(action='DESELECT')
-                    bpy.ops.object.mode_set(mode='OBJECT')
-                    for v_idx in thigh_verts:
-                        mesh_data.vertices[v_idx].select = True
-                    bpy.ops.object.mode_set(mode='EDIT')
-                    for _ in range(subdivision_factor):
-                        bpy.ops.mesh.subdivide(smoothness=0.5)
-                    bpy.ops.mesh.select_all(action='DESELECT')
-                    bpy.ops.object.mode_set(mode='OBJECT')
+                thigh_verts = set(cache.spatial_index.find_range(bone_center, bone_length * 0.6).tolist())  # Lower 60% of thigh
+
+                # Apply subdivision for retopology, topology changes are only described in a dry run
+                if subdivision_factor > 0 and thigh_verts and changes.dry_run:
+                    self.report({'INFO'}, f"Dry run: would subdivide {len(thigh_verts)} lower thigh vertices for {bone_name} {subdivision_factor} time(s)")
+                elif subdivision_factor > 0 and thigh_verts:
+                    # Bones and springs planned so far do not depend on vertex indices, commit them before subdividing
+                    changes.commit()
+                    selection = np.zeros(len(mesh_data.vertices), dtype=bool)
+                    selection[list(thigh_verts)] = True
+                    subdivide_region(mesh, selection, subdivision_factor, 0.5, context.scene.vrm_subdivision_max_edge_length, context.scene.vrm_subdivision_vertex_budget, self)
+                    cache.invalidate()
+                    cache.write_selection(np.zeros(len(mesh_data.vertices), dtype=bool))
                     self.report({'INFO'}, f"Subdivided lower thigh for {bone_name} {subdivision_factor} time(s)")
 
-                # Vertex groups for back gravity
-                back_vg = mesh.vertex_groups.get(f"Jiggle_{bone_name}_Back")
-                if not back_vg:
-                    back_vg = mesh.vertex_groups.new(name=f"Jiggle_{bone_name}_Back")
-                back_verts = []
-                back_weights = []
-                for v in mesh_data.vertices:
-                    if v.index in expanded_hips_vertices:
-                        continue
-                    v_pos = mesh.matrix_world @ v.co
-                    # Check if vertex is on the back (negative Y in local space, assuming Y is back)
-                    local_pos = armature.matrix_world.inverted() @ v_pos
-                    if local_pos.y < 0 and (v_pos - bone_center).length < affect_radius * 1.0:
-                        dist = abs(local_pos.y)
-                        weight = math.exp(-dist / (affect_radius * 0.5)) * 0.8
-                        weight = max(0.0, min(1.0, weight))
-                        if weight > 0.0:
-                            back_verts.append(v.index)
-                            back_weights.append(weight)
-                if back_verts:
-                    for v_idx, weight in zip(back_verts, back_weights):
-                        back_vg.add([v_idx], weight, 'REPLACE')
-                    bpy.context.object.vertex_groups.active = back_vg
-                    bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
-                    bpy.context.object.data.use_paint_mask_vertex = True
-                    bpy.ops.object.vertex_group_smooth(group_select_mode='ACTIVE', factor=0.5, repeat=3, expand=0.0)
-                    bpy.ops.object.mode_set(mode='OBJECT')
-                else:
-                    self.report({'WARNING'}, f"No vertices assigned to {back_vg.name}")
-
-                # Vertex groups for left and right side jiggle
-                for side in ['Left', 'Right']:
-                    side_vg = mesh.vertex_groups.get(f"Jiggle_{bone_name}_{side}")
-                    if not side_vg:
-                        side_vg = mesh.vertex_groups.new(name=f"Jiggle_{bone_name}_{side}")
-                    side_verts = []
-                    side_weights = []
-                    for v in mesh_data.vertices:
-                        if v.index in expanded_hips_vertices:
-                            continue
-                        v_pos = mesh.matrix_world @ v.co
-                        local_pos = armature.matrix_world.inverted() @ v_pos
-                        if side == 'Left' and local_pos.x > 0 and abs(local_pos.y) < 0.1 and (v_pos - bone_center).length < affect_radius * 0.8:
-                            dist = local_pos.x
-                            weight = math.exp(-dist / (affect_radius * 0.4)) * 0.7
-                            weight = max(0.0, min(1.0, weight))
-                            if weight > 0.0:
-                                side_verts.append(v.index)
-                                side_weights.append(weight)
-                        elif side == 'Right' and local_pos.x < 0 and abs(local_pos.y) < 0.1 and (v_pos - bone_center).length < affect_radius * 0.8:
-                            dist = -local_pos.x
-                            weight = math.exp(-dist / (affect_radius * 0.4)) * 0.7
-                            weight = max(0.0, min(1.0, weight))
-                            if weight > 0.0:
-                                side_verts.append(v.index)
-                                side_weights.append(weight)
-                    if side_verts:
-                        for v_idx, weight in zip(side_verts, side_weights):
-                            side_vg.add([v_idx], weight, 'REPLACE')
-                        bpy.context.object.vertex_groups.active = side_vg
-                        bpy.ops.object.mode_set(mode='WEIGHT_PAINT')
-                        bpy.context.object.data.use_paint_mask_vertex = True
-                        bpy.ops.object.vertex_group_smooth(group_select_mode='ACTIVE', factor=0.5, repeat=3, expand=0.0)
-                        bpy.ops.object.mode_set(mode='OBJECT')
+            # Weights are computed once both thighs are subdivided, so vertex indices no longer change
+            positions = cache.positions
+            use_mirror = context.scene.vrm_use_mirror
+            computed = {}
+            # Load the weight matrix first so the smoothing pass sees the weights queued below
+            cache.weights
+            jiggle_groups = []
+            for bone_name, bone_center in bone_centers:
+                # Only vertices within the affect radius, outside the hips, can receive back or side weights
+                nearby_verts = cache.spatial_index.find_range(bone_center, affect_radius)
+                nearby_verts = nearby_verts[~np.isin(nearby_verts, expanded_hips_vertices)]
+
+                # Mirror the other thigh's results when this region is its mirror image
+                regions = None
+                source_name = mirror_name(bone_name)
+                if use_mirror and source_name in computed:
+                    mirror_map = cache.mirror_map(context.scene.vrm_mirror_tolerance)
+                    source_verts, source_regions = computed[source_name]
+                    mismatch = mirror_map.region_mismatch(source_verts, nearby_verts)
+                    total = max(len(source_verts), len(nearby_verts))
+                    # Back and side weights are measured from the bone centre, so the thigh bones have to mirror each other as well
+                    if not mirror_map.points_mirrored(dict(bone_centers)[source_name], bone_center):
+                        self.report({'WARNING'}, f"{source_name} and {bone_name} bones are not symmetric, computing both sides")
+                    elif mirror_map.symmetric_enough(mismatch, total):
+                        regions = {}
+                        for side, (verts, weights) in source_regions.items():
+                            mirror_verts, mirror_weights, _ = mirror_map.mirror_weights(verts, weights)
+                            regions[mirror_name(side)] = (mirror_verts, mirror_weights)
+                        self.report({'INFO'}, f"Mirrored {source_name} jiggle weights to {bone_name} ({mismatch} of {total} vertices differ)")
+                    else:
+                        self.report({'WARNING'}, f"{source_name} and {bone_name} are not symmetric ({mismatch} of {total} vertices differ), computing both sides")
+                if regions is None:
+                    masks = jiggle_region_weights(positions[nearby_verts], world_to_armature, bone_center, affect_radius)
+                    regions = {side: (nearby_verts[mask], side_weights) for side, (mask, side_weights) in masks.items()}
+                computed[bone_name] = (nearby_verts, regions)
+
+                # Vertex groups for back gravity, then left and right side jiggle
+                for side in ['Back', 'Left', 'Right']:
+                    side_vg = changes.vertex_group(f"Jiggle_{bone_name}_{side}")
+                    verts, side_weights = regions[side]
+                    if len(verts):
+                        cache.writer.add(side_vg, verts, side_weights)
+                        jiggle_groups.append(side_vg)
                     else:
                         self.report({'WARNING'}, f"No vertices assigned to {side_vg.name}")
 
+            # One smoothing pass over every jiggle group, the selection is only read once
+            smooth_vertex_groups(cache, jiggle_groups, factor=0.5, repeat=3, expand=0.0)
+
             self.report({'INFO'}, f"Jiggle bones for thighs added with separate back gravity and side jiggle")
-            return {'FINISHED'}
+            return run.complete(self)
         except Exception as e:
             self.report({'ERROR'}, f"Error: {str(e)}")
             bpy.ops.object.mode_set(mode='OBJECT')
@@ -1717,7 +3103,8 @@ class VRM_OT_Breast_Blend_Shape_Scaler(bpy.types.Operator):
 
     def execute(self, context):
         try:
-            armature = next(obj for obj in bpy.data.objects if obj.type == 'ARMATURE')
+            run = RunContext.acquire(self)
+            armature = run.armature
             mesh = next((obj for obj in armature.children if obj.type == 'MESH' and "J_Sec_L_Bust2" in obj.vertex_groups), None)
             if not mesh:
                 self.report({'ERROR'}, "No mesh found with breast vertex groups")
@@ -1728,24 +3115,6 @@ class VRM_OT_Breast_Blend_Shape_Scaler(bpy.types.Operator):
             if not arm_mod:
                 self.report({'ERROR'}, "No armature modifier found on the mesh")
                 return {'CANCELLED'}
-            mod_name = arm_mod.name
-
-            # Add basis shape key if none exist
-            bpy.ops.object.select_all(action='DESELECT')
-            mesh.select_set(True)
-            bpy.context.view_layer.objects.active = mesh
-            bpy.ops.object.mode_set(mode='OBJECT')
-            if not mesh.data.shape_keys:
-                bpy.ops.object.shape_key_add(from_mix=False)  # Add Basis
-
-            # Select armature and enter pose mode
-            bpy.ops.object.select_all(action='DESELECT')
-            armature.select_set(True)
-            bpy.context.view_layer.objects.active = armature
-            bpy.ops.object.mode_set(mode='POSE')
-
-            # Store initial scales
-            initial_scales = {bone.name: bone.scale.copy() for bone in armature.pose.bones}
 
             # Define bust bones
             sides = ['L', 'R']
@@ -1759,52 +3128,68 @@ class VRM_OT_Breast_Blend_Shape_Scaler(bpy.types.Operator):
 
             if not bust_bones:
                 self.report({'WARNING'}, "No bust bones found")
-                bpy.ops.object.mode_set(mode='OBJECT')
                 return {'CANCELLED'}
 
-            # Scale bust bones to flatten
-            for bone_name in bust_bones:
-                bone = armature.pose.bones[bone_name]
-                bone.scale = (1, 0, 1)
-
-            # Apply pose as shape key on mesh
+            # Skin only the bust-weighted vertices with the bust bones scaled to flatten,
+            # the pose and the modifier stack are left untouched
+            skinning = BoneSkinning(mesh, armature, bust_bones, run.mesh_cache if mesh is run.mesh else None)
+            if not len(skinning.verts):
+                self.report({'WARNING'}, "No vertices weighted to the bust bones")
+                return {'CANCELLED'}
+            flatten_offsets = skinning.offsets((1.0, 0.0, 1.0))
+            self.report({'INFO'}, f"Evaluated {len(skinning.verts)} bust vertices")
+
+            changes = run.changes
+            if context.scene.vrm_breast_shape_mode == 'FAMILY':
+                # One skinning evaluation per target shape, every graded key reuses its offsets
+                keys = skinning.family("Breast_Flatten", flatten_offsets, context.scene.vrm_breast_flatten_steps)
+                if context.scene.vrm_breast_enlarge_steps > 0:
+                    enlarge_offsets = skinning.offsets(tuple(context.scene.vrm_breast_enlarge_scale))
+                    keys += skinning.family("Breast_Enlarge", enlarge_offsets, context.scene.vrm_breast_enlarge_steps)
+                for key_name, key_offsets in keys:
+                    changes.add_shape_key(skinning, key_name, key_offsets)
+                self.report({'INFO'}, f"Breast shape key family added: {', '.join(key_name for key_name, _ in keys)}")
+                return run.complete(self)
+
+            changes.add_shape_key(skinning, "Breast_Flatten", flatten_offsets, value=1.0)
+            self.report({'INFO'}, "Breast flatten shape key added and set to max value")
+            return run.complete(self)
+        except Exception as e:
+            self.report({'ERROR'}, f"Error: {str(e)}")
             bpy.ops.object.mode_set(mode='OBJECT')
-            bpy.ops.object.select_all(action='DESELECT')
-            mesh.select_set(True)
-            bpy.context.view_layer.objects.active = mesh
-            bpy.ops.object.modifier_apply_as_shapekey(keep_modifier=False, modifier=mod_name)
+            return {'CANCELLED'}
 
-            # Rename the new shape key
-            if mesh.data.shape_keys:
-                new_key = mesh.data.shape_keys.key_blocks[-1]
-                new_key.name = "Breast_Flatten"
-                new_key.value = 1.0
-            else:
-                self.report({'WARNING'}, "Shape key not created")
-                return {'CANCELLED'}
 
-            # Re-add armature modifier
-            bpy.ops.object.modifier_add(type='ARMATURE')
-            new_mod = mesh.modifiers[-1]
-            new_mod.object = armature
-            new_mod.name = mod_name
+class VRM_OT_Run_Recipe(bpy.types.Operator):
+    """Runs every step of a JSON or TOML enhancement recipe as a single undo step"""
+    bl_idname = "vrm.run_recipe"
+    bl_label = "Run Recipe"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_icon = 'SEQUENCE'
 
-            # Reset bone scales
-            bpy.ops.object.select_all(action='DESELECT')
-            armature.select_set(True)
-            bpy.context.view_layer.objects.active = armature
-            bpy.ops.object.mode_set(mode='POSE')
-            for bone_name in bust_bones:
-                armature.pose.bones[bone_name].scale = initial_scales[bone_name]
-            bpy.ops.object.mode_set(mode='OBJECT')
+    def execute(self, context):
+        try:
+            recipe = load_recipe(context.scene.vrm_recipe_path)
+        except Exception as e:
+            self.report({'ERROR'}, f"Could not load recipe: {str(e)}")
+            return {'CANCELLED'}
 
-            self.report({'INFO'}, "Breast flatten shape key added and set to max value")
-            return {'FINISHED'}
+        start_time = time.perf_counter()
+        try:
+            timings = run_recipe(recipe, self)
         except Exception as e:
-            self.report({'ERROR'}, f"Error: {str(e)}")
-            bpy.ops.object.mode_set(mode='OBJECT')
+            self.report({'ERROR'}, f"Recipe stopped: {str(e)}")
+            # The plan is dropped, but subdivision and scaling commit early and a cancelled operator pushes no undo step
+            bpy.ops.ed.undo_push(message="Run Recipe (incomplete)")
+            if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
             return {'CANCELLED'}
 
+        for idname, seconds in timings:
+            self.report({'INFO'}, f"{idname}: {seconds * 1000:.1f} ms")
+        self.report({'INFO'}, f"Recipe {recipe.get('name', context.scene.vrm_recipe_path)} ran {len(timings)} step(s) in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        return {'FINISHED'}
+
 
 class VRM_PT_Physics_Enhancer_Panel(bpy.types.Panel):
     """Creates a panel for VRM Physics Enhancer"""
@@ -1830,8 +3215,15 @@ class VRM_PT_Physics_Enhancer_Panel(bpy.types.Panel):
         breast_tweaker_box.prop(context.scene, "vrm_breast_end_shrink_factor")
         breast_tweaker_box.prop(context.scene, "vrm_breast_end_weight_reduction")
         breast_tweaker_box.prop(context.scene, "vrm_breast_gravity_power")
+        breast_tweaker_box.prop(context.scene, "vrm_breast_tweaker_engine")
         breast_tweaker_box.operator("vrm.breast_physics_tweaker", icon='MOD_PHYSICS')
-        breast_box.operator("vrm.breast_blend_shape_scaler", icon='SHAPEKEY_DATA')
+        breast_shape_box = breast_box.box()
+        breast_shape_box.prop(context.scene, "vrm_breast_shape_mode")
+        if context.scene.vrm_breast_shape_mode == 'FAMILY':
+            breast_shape_box.prop(context.scene, "vrm_breast_flatten_steps")
+            breast_shape_box.prop(context.scene, "vrm_breast_enlarge_scale")
+            breast_shape_box.prop(context.scene, "vrm_breast_enlarge_steps")
+        breast_shape_box.operator("vrm.breast_blend_shape_scaler", icon='SHAPEKEY_DATA')
 
         # Basics Section
         layout.label(text="Basics", icon='OUTLINER_OB_ARMATURE')
@@ -1878,6 +3270,8 @@ class VRM_PT_Physics_Enhancer_Panel(bpy.types.Panel):
         topology_box.label(text="Topology Settings:")
         topology_box.prop(context.scene, "vrm_dress_subdivision_count")
         topology_box.prop(context.scene, "vrm_dress_subdivision_smoothness")
+        topology_box.prop(context.scene, "vrm_subdivision_vertex_budget")
+        topology_box.prop(context.scene, "vrm_subdivision_max_edge_length")
         topology_box.operator("vrm.improve_long_dress_topology", icon='MESH_DATA')
 
         # Scaling Section
@@ -1916,8 +3310,29 @@ class VRM_PT_Physics_Enhancer_Panel(bpy.types.Panel):
             jiggle_params_box.prop(context.scene, "vrm_jiggle_joint_radius_third")
             jiggle_params_box.prop(context.scene, "vrm_jiggle_gravity_power")
             jiggle_params_box.prop(context.scene, "vrm_jiggle_subdivision_factor")
+            jiggle_params_box.prop(context.scene, "vrm_subdivision_vertex_budget")
+            jiggle_params_box.prop(context.scene, "vrm_subdivision_max_edge_length")
         jiggle_box.operator("vrm.add_jiggle_bones", icon='BONE_DATA')
 
+        # Diagnostics Section
+        layout.label(text="Diagnostics", icon='INFO')
+        diagnostics_box = layout.box()
+        diagnostics_box.prop(context.scene, "vrm_diagnostics_level")
+        diagnostics_box.prop(context.scene, "vrm_diagnostics_dump_path")
+        diagnostics_box.prop(context.scene, "vrm_dry_run")
+
+        # Symmetry Section
+        layout.label(text="Symmetry", icon='MOD_MIRROR')
+        symmetry_box = layout.box()
+        symmetry_box.prop(context.scene, "vrm_use_mirror")
+        symmetry_box.prop(context.scene, "vrm_mirror_tolerance")
+
+        # Recipe Section
+        layout.label(text="Recipes", icon='SEQUENCE')
+        recipe_box = layout.box()
+        recipe_box.prop(context.scene, "vrm_recipe_path")
+        recipe_box.operator("vrm.run_recipe", icon='PLAY')
+
 
 def register():
     bpy.utils.register_class(VRM_OT_Add_Breast_Physics_Colliders)
@@ -1931,6 +3346,7 @@ def register():
     bpy.utils.register_class(VRM_OT_Set_Breast_Physics_Preset)
     bpy.utils.register_class(VRM_OT_Set_Jiggle_Physics_Preset)
     bpy.utils.register_class(VRM_OT_Breast_Blend_Shape_Scaler)
+    bpy.utils.register_class(VRM_OT_Run_Recipe)
     bpy.utils.register_class(VRM_PT_Physics_Enhancer_Panel)
     bpy.types.Scene.vrm_breast_gravity_power = bpy.props.FloatProperty(
         name="Gravity Power",
@@ -1970,6 +3386,7 @@ def unregister():
     bpy.utils.unregister_class(VRM_OT_Set_Breast_Physics_Preset)
     bpy.utils.unregister_class(VRM_OT_Set_Jiggle_Physics_Preset)
     bpy.utils.unregister_class(VRM_OT_Breast_Blend_Shape_Scaler)
+    bpy.utils.unregister_class(VRM_OT_Run_Recipe)
     bpy.utils.unregister_class(VRM_PT_Physics_Enhancer_Panel)
     del bpy.types.Scene.vrm_jiggle_bone_pair
     del bpy.types.Scene.vrm_jiggle_bone_quantity
@@ -1992,6 +3409,8 @@ def unregister():
     del bpy.types.Scene.vrm_jiggle_params_collapsed
     del bpy.types.Scene.vrm_dress_subdivision_count
     del bpy.types.Scene.vrm_dress_subdivision_smoothness
+    del bpy.types.Scene.vrm_subdivision_vertex_budget
+    del bpy.types.Scene.vrm_subdivision_max_edge_length
     del bpy.types.Scene.vrm_dress_collider_radius
     del bpy.types.Scene.vrm_upper_leg_collider_multiplier
     del bpy.types.Scene.vrm_skirt_hit_radius_first
@@ -2019,6 +3438,17 @@ def unregister():
     del bpy.types.Scene.vrm_breast_end_weight_reduction
     del bpy.types.Scene.vrm_breast_bone_count
     del bpy.types.Scene.vrm_breast_physics_preset
+    del bpy.types.Scene.vrm_breast_tweaker_engine
+    del bpy.types.Scene.vrm_breast_shape_mode
+    del bpy.types.Scene.vrm_breast_flatten_steps
+    del bpy.types.Scene.vrm_breast_enlarge_scale
+    del bpy.types.Scene.vrm_breast_enlarge_steps
+    del bpy.types.Scene.vrm_diagnostics_level
+    del bpy.types.Scene.vrm_diagnostics_dump_path
+    del bpy.types.Scene.vrm_dry_run
+    del bpy.types.Scene.vrm_recipe_path
+    del bpy.types.Scene.vrm_use_mirror
+    del bpy.types.Scene.vrm_mirror_tolerance
     del bpy.types.Scene.vrm_breast_gravity_power
     del bpy.types.Scene.vrm_jiggle_bone_count
     del bpy.types.Scene.vrm_jiggle_physics_preset